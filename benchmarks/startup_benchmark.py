@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Measure how long the logger takes from launch until the first log entry is
+captured. Each run uses a fresh interpreter so import costs are included, and
+runs the real GameLogger.start_logging, once with memory reading disabled and
+once with it enabled (the game process is searched for but not found).
+
+Usage: python benchmarks/startup_benchmark.py [runs]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STARTUP_BUDGET_MS = 100
+
+# Runs GameLogger.start_logging on the main thread, as game_logger.py does, and
+# stops it from a watcher thread once the first entry has been captured
+RUN_SCRIPT = """
+import json, sys, threading, time
+import game_logger
+imported = time.perf_counter()
+game_logger.MEMORY_SETTINGS["enabled"] = sys.argv[1] == "enabled"
+game_logger.MEMORY_SETTINGS["process_name"] = "startup-benchmark-no-such-game"
+logger = game_logger.GameLogger()
+constructed = time.perf_counter()
+
+def stop_after_first_capture():
+    while logger.capture_started is None:
+        time.sleep(0.001)
+    logger.stop_logging()
+
+threading.Thread(target=stop_after_first_capture, daemon=True).start()
+logger.start_logging()
+captured = logger.capture_started
+print(json.dumps({
+    "import_ms": (imported - game_logger.LAUNCH_TIME) * 1000,
+    "construct_ms": (constructed - imported) * 1000,
+    "first_capture_ms": (captured - constructed) * 1000,
+    "total_ms": (captured - game_logger.LAUNCH_TIME) * 1000
+}))
+"""
+
+MEMORY_MODES = ("disabled", "enabled")
+
+def run_once(work_dir, memory_mode):
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    result = subprocess.run(
+        [sys.executable, "-c", RUN_SCRIPT, memory_mode],
+        cwd=work_dir, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+    over_budget = False
+    with tempfile.TemporaryDirectory() as work_dir:
+        # The first run warms the bytecode cache and is not counted
+        run_once(work_dir, MEMORY_MODES[0])
+
+        for memory_mode in MEMORY_MODES:
+            samples = [run_once(work_dir, memory_mode) for _ in range(runs)]
+
+            print(f"Startup benchmark, memory reading {memory_mode} ({runs} runs)")
+            for phase in ("import_ms", "construct_ms", "first_capture_ms", "total_ms"):
+                values = [sample[phase] for sample in samples]
+                print(f"  {phase:<16} median {statistics.median(values):7.1f}  "
+                      f"min {min(values):7.1f}  max {max(values):7.1f}")
+
+            median_total = statistics.median(sample["total_ms"] for sample in samples)
+            status = "OK" if median_total < STARTUP_BUDGET_MS else "OVER BUDGET"
+            print(f"Capture begins after {median_total:.1f}ms (budget {STARTUP_BUDGET_MS}ms): {status}")
+            over_budget = over_budget or median_total >= STARTUP_BUDGET_MS
+
+    return 1 if over_budget else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,331 @@
+import json
+import logging
+import os
+import sqlite3
+from threading import Lock
+
+DEFAULT_CATALOG_PATH = os.path.join('game_logs', 'catalog.db')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    start_time REAL,
+    end_time REAL,
+    duration REAL,
+    max_round INTEGER,
+    kills INTEGER,
+    headshots INTEGER,
+    accuracy REAL,
+    entries INTEGER,
+    log_file TEXT,
+    rollup_file TEXT
+);
+CREATE TABLE IF NOT EXISTS rounds (
+    session_id TEXT NOT NULL,
+    round INTEGER NOT NULL,
+    start_time REAL,
+    end_time REAL,
+    duration REAL,
+    kills INTEGER,
+    headshots INTEGER,
+    accuracy REAL,
+    entries INTEGER,
+    PRIMARY KEY (session_id, round)
+);
+CREATE TABLE IF NOT EXISTS weapons (
+    session_id TEXT NOT NULL,
+    round INTEGER NOT NULL,
+    weapon TEXT NOT NULL,
+    PRIMARY KEY (session_id, round, weapon)
+);
+CREATE TABLE IF NOT EXISTS segments (
+    session_id TEXT NOT NULL,
+    log_file TEXT NOT NULL,
+    byte_offset INTEGER NOT NULL,
+    byte_length INTEGER NOT NULL,
+    entries INTEGER,
+    first_timestamp REAL,
+    last_timestamp REAL,
+    first_round INTEGER,
+    last_round INTEGER,
+    PRIMARY KEY (log_file, byte_offset)
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_max_round ON sessions (max_round);
+CREATE INDEX IF NOT EXISTS idx_sessions_start_time ON sessions (start_time);
+CREATE INDEX IF NOT EXISTS idx_rounds_round ON rounds (round);
+CREATE INDEX IF NOT EXISTS idx_weapons_weapon ON weapons (weapon, session_id);
+CREATE INDEX IF NOT EXISTS idx_segments_session ON segments (session_id, first_round);
+"""
+
+def read_segment(log_file, offset, length):
+    """Read a single appended JSON segment from a log file."""
+    with open(log_file, 'rb') as f:
+        f.seek(offset)
+        data = json.loads(f.read(length))
+    return data if isinstance(data, list) else [data]
+
+def iter_log_segments(log_file, block_size=1024 * 1024):
+    """
+    Yield the JSON segments of a log file one at a time.
+
+    Log files are written by appending one JSON array per save, so a plain
+    json.load only works for files with a single segment. The file is read
+    in blocks, so only about one segment is held in memory at a time.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    at_eof = False
+    with open(log_file, 'r') as f:
+        while True:
+            buffer = buffer.lstrip()
+            if not buffer:
+                if at_eof:
+                    return
+                block = f.read(block_size)
+                at_eof = not block
+                buffer = block
+                continue
+
+            try:
+                data, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                if at_eof:
+                    raise
+                # Segment continues past the buffer; grow it geometrically so
+                # large segments are re-parsed only a few times
+                block = f.read(max(block_size, len(buffer)))
+                at_eof = not block
+                buffer += block
+                continue
+
+            buffer = buffer[end:]
+            yield data if isinstance(data, list) else [data]
+
+class _RoundSummary:
+    """In-progress aggregates for one round of a session."""
+
+    def __init__(self, round_number, timestamp, kills_baseline, headshots_baseline):
+        self.round = round_number
+        self.start_time = timestamp
+        self.end_time = timestamp
+        self.kills_baseline = kills_baseline
+        self.headshots_baseline = headshots_baseline
+        self.kills = kills_baseline
+        self.headshots = headshots_baseline
+        self.accuracy_sum = 0.0
+        self.entries = 0
+        self.weapons = set()
+
+    def row(self, session_id):
+        return (
+            session_id,
+            self.round,
+            self.start_time,
+            self.end_time,
+            self.end_time - self.start_time,
+            self.kills - self.kills_baseline,
+            self.headshots - self.headshots_baseline,
+            self.accuracy_sum / self.entries if self.entries else 0.0,
+            self.entries
+        )
+
+class _SessionSummary:
+    """In-progress aggregates for a session being written."""
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.rounds = {}
+        self.start_time = None
+        self.end_time = None
+        self.last_kills = None
+        self.last_headshots = None
+        self.kills_baseline = None
+        self.headshots_baseline = None
+
+    def add_entry(self, entry):
+        """Fold a log entry into the session and return its round number."""
+        timestamp = entry.get('timestamp', 0)
+        game_state = entry.get('game_state', {})
+        game = game_state.get('game', {})
+        player = game_state.get('player', {})
+        outcomes = game.get('outcomes', {})
+        weapon = player.get('weapon', {})
+
+        # Kill and headshot counters are cumulative, so rounds store deltas
+        kills = outcomes.get('kills', 0)
+        headshots = outcomes.get('headshots', 0)
+        if self.last_kills is None:
+            self.kills_baseline = self.last_kills = kills
+            self.headshots_baseline = self.last_headshots = headshots
+
+        round_number = game.get('round', 0)
+        round_summary = self.rounds.get(round_number)
+        if round_summary is None:
+            round_summary = _RoundSummary(round_number, timestamp, self.last_kills, self.last_headshots)
+            self.rounds[round_number] = round_summary
+
+        if self.start_time is None:
+            self.start_time = timestamp
+        self.end_time = timestamp
+
+        round_summary.end_time = timestamp
+        round_summary.kills = kills
+        round_summary.headshots = headshots
+        round_summary.accuracy_sum += weapon.get('accuracy', 0)
+        round_summary.entries += 1
+        if weapon.get('name'):
+            round_summary.weapons.add(weapon['name'])
+
+        self.last_kills = kills
+        self.last_headshots = headshots
+        return round_number
+
+    def row(self, log_file, rollup_file):
+        entries = sum(r.entries for r in self.rounds.values())
+        accuracy_sum = sum(r.accuracy_sum for r in self.rounds.values())
+        return (
+            self.session_id,
+            self.start_time,
+            self.end_time,
+            self.end_time - self.start_time,
+            max(self.rounds),
+            self.last_kills - self.kills_baseline,
+            self.last_headshots - self.headshots_baseline,
+            accuracy_sum / entries if entries else 0.0,
+            entries,
+            log_file,
+            rollup_file
+        )
+
+class SessionCatalog:
+    """
+    SQLite catalog of per-session and per-round summaries.
+
+    Populated as log segments are written, so sessions can be selected
+    with an indexed query before any raw log data is opened.
+    """
+
+    def __init__(self, path=DEFAULT_CATALOG_PATH):
+        self.path = path
+        # stop_logging may run on a different thread than the logging loop
+        self.lock = Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+        self._sessions = {}
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def record_segment(self, session_id, log_file, offset, length, entries, rollup_file=None):
+        """Catalog a segment that was just appended to a session's log file."""
+        if not entries:
+            return
+
+        with self.lock:
+            self._record_segment(session_id, log_file, offset, length, entries, rollup_file)
+
+    def _record_segment(self, session_id, log_file, offset, length, entries, rollup_file):
+        summary = self._sessions.get(session_id)
+        if summary is None:
+            summary = self._sessions[session_id] = _SessionSummary(session_id)
+
+        touched_rounds = []
+        for entry in entries:
+            round_number = summary.add_entry(entry)
+            if not touched_rounds or touched_rounds[-1] != round_number:
+                touched_rounds.append(round_number)
+
+        try:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO segments VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (session_id, log_file, offset, length, len(entries),
+                     entries[0].get('timestamp'), entries[-1].get('timestamp'),
+                     min(touched_rounds), max(touched_rounds))
+                )
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    summary.row(log_file, rollup_file)
+                )
+                for round_number in set(touched_rounds):
+                    round_summary = summary.rounds[round_number]
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO rounds VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        round_summary.row(session_id)
+                    )
+                    self.conn.executemany(
+                        "INSERT OR IGNORE INTO weapons VALUES (?, ?, ?)",
+                        [(session_id, round_number, weapon) for weapon in round_summary.weapons]
+                    )
+        except sqlite3.Error as e:
+            logging.error(f"Error updating catalog {self.path}: {str(e)}", exc_info=True)
+
+    def find_sessions(self, min_round=None, weapon=None, since=None, limit=None):
+        """
+        Return session summaries matching the given filters, newest first.
+
+        weapon matches sessions where the weapon was used in a round at or
+        above min_round (or in any round if min_round is not given).
+        """
+        query = "SELECT * FROM sessions s WHERE 1 = 1"
+        params = []
+        if min_round is not None:
+            query += " AND s.max_round >= ?"
+            params.append(min_round)
+        if since is not None:
+            query += " AND s.start_time >= ?"
+            params.append(since)
+        if weapon is not None:
+            query += " AND EXISTS (SELECT 1 FROM weapons w WHERE w.session_id = s.session_id AND w.weapon = ?"
+            params.append(weapon)
+            if min_round is not None:
+                query += " AND w.round >= ?"
+                params.append(min_round)
+            query += ")"
+        query += " ORDER BY s.start_time DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        with self.lock:
+            return [dict(row) for row in self.conn.execute(query, params)]
+
+    def find_rounds(self, session_id=None, min_round=None, weapon=None):
+        """Return per-round summaries matching the given filters."""
+        query = "SELECT r.* FROM rounds r WHERE 1 = 1"
+        params = []
+        if session_id is not None:
+            query += " AND r.session_id = ?"
+            params.append(session_id)
+        if min_round is not None:
+            query += " AND r.round >= ?"
+            params.append(min_round)
+        if weapon is not None:
+            query += (" AND EXISTS (SELECT 1 FROM weapons w WHERE w.session_id = r.session_id"
+                      " AND w.round = r.round AND w.weapon = ?)")
+            params.append(weapon)
+        query += " ORDER BY r.session_id, r.round"
+
+        rounds = []
+        with self.lock:
+            for row in self.conn.execute(query, params).fetchall():
+                summary = dict(row)
+                summary['weapons'] = [w[0] for w in self.conn.execute(
+                    "SELECT weapon FROM weapons WHERE session_id = ? AND round = ?",
+                    (summary['session_id'], summary['round'])
+                )]
+                rounds.append(summary)
+        return rounds
+
+    def get_segments(self, session_id, min_round=None):
+        """Return the file locations of a session's log segments in write order."""
+        query = "SELECT * FROM segments WHERE session_id = ?"
+        params = [session_id]
+        if min_round is not None:
+            query += " AND last_round >= ?"
+            params.append(min_round)
+        query += " ORDER BY log_file, byte_offset"
+        with self.lock:
+            return [dict(row) for row in self.conn.execute(query, params)]
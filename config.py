@@ -7,6 +7,55 @@ LOG_SETTINGS = {
     "format": "json"  # Log format (json or csv)
 }
 
+# Frame timing settings
+FRAME_TIMING_SETTINGS = {
+    "window": 16384,  # Tick intervals kept in the rolling window (~4.5 min at 60 Hz)
+    "jitter_bins_ms": [0.25, 0.5, 1, 2, 4, 8, 16]  # Edges for |interval - target| histogram
+}
+
+# Live playstyle inference settings
+PLAYSTYLE_SETTINGS = {
+    "enabled": True,
+    "model_directory": "models",  # Trained with training.py; default weights if empty
+    "window": 120,  # Recent ticks the classifier looks at (2 s at 60 Hz)
+    "min_confidence": 0.5,  # Minimum probability before the behavior switches
+    "latency_budget_ms": 0.5
+}
+
+# Tick budget settings: optional work is shed when most ticks in the last
+# second cost more than overload_ratio of the budget (1 / frequency), and
+# restored after a full second below recovery_ratio
+BUDGET_SETTINGS = {
+    "overload_ratio": 0.9,
+    "recovery_ratio": 0.5,
+    "degraded_environment_interval": 5.0,  # Seconds between environment samples
+    "degraded_mouse_poll_ticks": 4  # Poll the mouse position every N ticks
+}
+
+# Game state collection settings: minimum seconds between collections of each
+# section (0 = every tick, None = only when the section is marked dirty)
+COLLECTION_SETTINGS = {
+    "player": 0,
+    "game": 0,
+    "environment": 1.0,  # Doors, power and cover rarely change
+    "actions": 0  # Tactical state (sprinting, crouching, ...) changes every frame
+}
+
+# Game memory reader settings. Each struct is found by following a pointer
+# chain from "base" and read as one contiguous region; "fields" maps dotted
+# paths within the game state section to [offset, struct format]. Addresses
+# and offsets depend on the game build, e.g.:
+#   "player": {"section": "player", "base": 0x400000, "offsets": [0x1000, 0x0],
+#              "fields": {"health": [0x1C8, "i"], "position.x": [0x18, "f"]}}
+MEMORY_SETTINGS = {
+    "enabled": False,
+    "process_name": "CoDWaW.exe",
+    "pointer_size": 4,
+    "revalidate_interval": 1.0,  # Seconds between pointer chain checks
+    "attach_interval": 10.0,  # Seconds between searches for the game process
+    "structs": {}
+}
+
 # Input tracking settings
 INPUT_SETTINGS = {
     "track_keyboard": True,
@@ -20,7 +69,8 @@ PERFORMANCE_SETTINGS = {
     "monitor_cpu": True,
     "monitor_memory": True,
     "warning_threshold_cpu": 80,  # Percentage
-    "warning_threshold_memory": 80  # Percentage
+    "warning_threshold_memory": 80,  # Percentage
+    "sample_interval": 1.0  # Seconds between resource samples
 }
 
 # File settings
@@ -1,158 +1,279 @@
 import time
 import logging
+from config import COLLECTION_SETTINGS
+from memory_reader import MemoryReadError
 from utils import performance_monitor
 
+class SubCollector:
+    """A section of the game state with its own sampling policy."""
+
+    def __init__(self, name, collect, interval=0, is_dirty=None):
+        self.name = name
+        self.collect = collect
+        self.interval = interval
+        self.is_dirty = is_dirty
+        self.value = None
+        self.last_collected = 0
+        self.dirty = True
+
+    def needs_update(self, current_time):
+        """Check whether the section has to be collected this tick."""
+        if self.value is None or self.dirty:
+            return True
+        if self.is_dirty is not None and self.is_dirty():
+            return True
+        return self.interval is not None and current_time - self.last_collected >= self.interval
+
 class DataCollector:
-    def __init__(self):
+    def __init__(self, intervals=None, memory_reader=None):
+        self.memory_reader = memory_reader
+        self.memory_values = {}
+        self.memory_error_logged = False
         self.last_game_state = None
-        self.last_update = time.time()
+        self.start_time = time.time()
+        self.last_update = self.start_time
         self.last_action = None
         self.behavior_start_time = time.time()
         self.current_behavior = "neutral"  # Can be: aggressive, defensive, neutral
+        self.behavior_labeled = False  # True once a caller has reported the behavior
+        self.inferred_behavior = None  # Playstyle model output, kept apart from the label
+        self.style_score = 0.0  # -1 (defensive) to 1 (aggressive)
+        self.unchanged_sections = []
+
+        # Sections are collected in registration order
+        intervals = {**COLLECTION_SETTINGS, **(intervals or {})}
+        self.collectors = {}
+        self.register_collector("player", self._collect_player, intervals["player"])
+        self.register_collector("game", self._collect_game, intervals["game"])
+        self.register_collector("environment", self._collect_environment, intervals["environment"])
+        self.register_collector("actions", self._collect_actions, intervals["actions"])
+
+    def register_collector(self, name, collect, interval=0, is_dirty=None):
+        """
+        Register a game state section.
+
+        collect(current_time) builds the section. interval is the minimum
+        time in seconds between collections (0 for every tick, None to only
+        collect when the section is marked dirty). is_dirty is an optional
+        cheap hook that returns True when the section's source changed.
+        """
+        self.collectors[name] = SubCollector(name, collect, interval, is_dirty)
+
+    def set_interval(self, name, interval):
+        """Change how often a section is collected."""
+        self.collectors[name].interval = interval
+
+    def mark_dirty(self, name):
+        """Force a section to be collected on the next tick."""
+        if name in self.collectors:
+            self.collectors[name].dirty = True
 
     @performance_monitor
     def get_game_state(self):
         """
         Collect current game state data.
-        This is a mock implementation - in real usage, this would interface
-        with the game's memory or API.
+        Sections are mock data, overlaid with values read from game memory
+        when a memory reader is attached.
+
+        Only sections that are due or whose source changed are collected;
+        the others reuse the previous section by reference and are listed
+        in unchanged_sections.
         """
         current_time = time.time()
 
+        due = [name for name, collector in self.collectors.items() if collector.needs_update(current_time)]
+        if self.memory_reader:
+            self._read_memory(due)
+
+        game_state = {}
+        unchanged = []
+        for name, collector in self.collectors.items():
+            if name in due:
+                collector.value = collector.collect(current_time)
+                self._apply_memory_values(name, collector.value)
+                collector.last_collected = current_time
+                collector.dirty = False
+            else:
+                unchanged.append(name)
+            game_state[name] = collector.value
+
+        self.unchanged_sections = unchanged
+        self.last_game_state = game_state
+        self.last_update = current_time
+
+        return game_state
+
+    def _read_memory(self, sections):
+        """Read the structs of all due sections in one batch."""
+        try:
+            self.memory_values = self.memory_reader.read_sections(sections)
+            self.memory_error_logged = False
+        except MemoryReadError as e:
+            self.memory_values = {}
+            if not self.memory_error_logged:
+                logging.warning(f"Reading game memory failed, using mock values: {str(e)}")
+                self.memory_error_logged = True
+
+    def _apply_memory_values(self, section_name, section):
+        """Overlay values read from memory onto a section by dotted path."""
+        for path, value in self.memory_values.get(section_name, {}).items():
+            target = section
+            *parents, key = path.split('.')
+            for parent in parents:
+                target = target.setdefault(parent, {})
+            target[key] = value
+
+    def _collect_player(self, current_time):
+        """Collect player position, weapon, perks and behavior."""
+        # Mock game state data for CoD: World at War Zombies
         # Track time spent in current behavior
         behavior_duration = current_time - self.behavior_start_time
 
-        # Mock game state data for CoD: World at War Zombies
-        game_state = {
-            "player": {
-                "position": {
-                    "x": 0.0,
-                    "y": 0.0,
-                    "z": 0.0
-                },
-                "camera": {
-                    "pitch": 0.0,
-                    "yaw": 0.0,
-                    "roll": 0.0
-                },
-                "health": 100,
-                "armor": 100,
-                "weapon": {
-                    "active": "primary",
-                    "ammo": {
-                        "current": 30,
-                        "reserve": 120
-                    },
-                    "name": "MP40",
-                    "last_reload_time": current_time,
-                    "shots_fired": 0,
-                    "hits": 0,
-                    "accuracy": 0.0,
-                    "recoil_control": 0.0,  # Added for ML analysis
-                    "target_acquisition_time": 0.0  # Added for ML analysis
-                },
-                "perks": {
-                    "juggernog": False,
-                    "quick_revive": False,
-                    "double_tap": False,
-                    "speed_cola": False
-                },
-                "points": 500,
-                "behavior": {
-                    "current": self.current_behavior,
-                    "duration": behavior_duration,
-                    "style_score": 0.0,  # Added for ML analysis
-                    "efficiency_rating": 0.0  # Added for ML analysis
-                },
-                "performance_metrics": {  # Added for ML analysis
-                    "average_accuracy": 0.0,
-                    "survival_time": 0.0,
-                    "points_per_minute": 0.0,
-                    "kills_per_minute": 0.0
-                }
+        return {
+            "position": {
+                "x": 0.0,
+                "y": 0.0,
+                "z": 0.0
             },
-            "game": {
-                "time_elapsed": current_time - self.last_update,
-                "round": 1,
-                "zombies": {
-                    "total": 24,
-                    "alive": 20,
-                    "spawned": 4,
-                    "killed": 0,
-                    "spawn_patterns": [],  # Added for ML analysis
-                    "threat_levels": []  # Added for ML analysis
-                },
-                "power_ups": {
-                    "active": None,
-                    "time_remaining": 0,
-                    "efficiency_rating": 0.0  # Added for ML analysis
-                },
-                "score": 0,
-                "outcomes": {
-                    "kills": 0,
-                    "headshots": 0,
-                    "damage_dealt": 0,
-                    "deaths": 0,
-                    "revives": 0,
-                    "survival_rounds": [],  # Added for ML analysis
-                    "achievement_progress": {}  # Added for ML analysis
-                }
+            "camera": {
+                "pitch": 0.0,
+                "yaw": 0.0,
+                "roll": 0.0
             },
-            "environment": {
-                "enemies_visible": [],
-                "in_cover": False,
-                "doors_open": [],
-                "power_on": False,
-                "interactive_objects": {
-                    "mystery_box_location": "spawn",
-                    "active_traps": [],
-                    "available_doors": [
-                        {"id": "door_1", "cost": 750},
-                        {"id": "door_2", "cost": 1000}
-                    ]
+            "health": 100,
+            "armor": 100,
+            "weapon": {
+                "active": "primary",
+                "ammo": {
+                    "current": 30,
+                    "reserve": 120
                 },
-                "danger_zones": [],  # Added for ML analysis
-                "safe_zones": [],  # Added for ML analysis
-                "resource_hotspots": []  # Added for ML analysis
+                "name": "MP40",
+                "last_reload_time": current_time,
+                "shots_fired": 0,
+                "hits": 0,
+                "accuracy": 0.0,
+                "recoil_control": 0.0,  # Added for ML analysis
+                "target_acquisition_time": 0.0  # Added for ML analysis
             },
-            "actions": {
-                "last_action": self.last_action,
-                "tactical": {
-                    "peeking": False,
-                    "sprinting": False,
-                    "crouching": False,
-                    "decision_quality": 0.0,  # Added for ML analysis
-                    "reaction_time": 0.0  # Added for ML analysis
-                },
-                "strategy_metrics": {  # Added for ML analysis
-                    "positioning_score": 0.0,
-                    "resource_management": 0.0,
-                    "team_coordination": 0.0,
-                    "objective_focus": 0.0
-                }
+            "perks": {
+                "juggernog": False,
+                "quick_revive": False,
+                "double_tap": False,
+                "speed_cola": False
+            },
+            "points": 500,
+            "behavior": {
+                "current": self.current_behavior,
+                "labeled": self.behavior_labeled,
+                "duration": behavior_duration,
+                "inferred": self.inferred_behavior,
+                "style_score": self.style_score,  # Added for ML analysis
+                "efficiency_rating": 0.0  # Added for ML analysis
+            },
+            "performance_metrics": {  # Added for ML analysis
+                "average_accuracy": 0.0,
+                "survival_time": 0.0,
+                "points_per_minute": 0.0,
+                "kills_per_minute": 0.0
             }
         }
 
-        self.last_game_state = game_state
-        self.last_update = current_time
+    def _collect_game(self, current_time):
+        """Collect round, zombie and outcome data."""
+        return {
+            "time_elapsed": current_time - self.start_time,
+            "round": 1,
+            "zombies": {
+                "total": 24,
+                "alive": 20,
+                "spawned": 4,
+                "killed": 0,
+                "spawn_patterns": [],  # Added for ML analysis
+                "threat_levels": []  # Added for ML analysis
+            },
+            "power_ups": {
+                "active": None,
+                "time_remaining": 0,
+                "efficiency_rating": 0.0  # Added for ML analysis
+            },
+            "score": 0,
+            "outcomes": {
+                "kills": 0,
+                "headshots": 0,
+                "damage_dealt": 0,
+                "deaths": 0,
+                "revives": 0,
+                "survival_rounds": [],  # Added for ML analysis
+                "achievement_progress": {}  # Added for ML analysis
+            }
+        }
 
-        return game_state
+    def _collect_environment(self, current_time):
+        """Collect map state: doors, power, cover and interactive objects."""
+        return {
+            "enemies_visible": [],
+            "in_cover": False,
+            "doors_open": [],
+            "power_on": False,
+            "interactive_objects": {
+                "mystery_box_location": "spawn",
+                "active_traps": [],
+                "available_doors": [
+                    {"id": "door_1", "cost": 750},
+                    {"id": "door_2", "cost": 1000}
+                ]
+            },
+            "danger_zones": [],  # Added for ML analysis
+            "safe_zones": [],  # Added for ML analysis
+            "resource_hotspots": []  # Added for ML analysis
+        }
+
+    def _collect_actions(self, current_time):
+        """Collect the last action and tactical state."""
+        return {
+            "last_action": self.last_action,
+            "tactical": {
+                "peeking": False,
+                "sprinting": False,
+                "crouching": False,
+                "decision_quality": 0.0,  # Added for ML analysis
+                "reaction_time": 0.0  # Added for ML analysis
+            },
+            "strategy_metrics": {  # Added for ML analysis
+                "positioning_score": 0.0,
+                "resource_management": 0.0,
+                "team_coordination": 0.0,
+                "objective_focus": 0.0
+            }
+        }
 
     def update_game_state(self, new_state):
         """Update the current game state with new data."""
         self.last_game_state = new_state
         self.last_update = time.time()
+        for name, section in new_state.items():
+            if name in self.collectors:
+                self.collectors[name].value = section
+                self.collectors[name].last_collected = self.last_update
 
     def update_behavior(self, new_behavior):
         """Update player behavior tracking."""
+        self.behavior_labeled = True
         if new_behavior != self.current_behavior:
             self.current_behavior = new_behavior
             self.behavior_start_time = time.time()
 
+    def update_inferred_behavior(self, behavior, style_score):
+        """Record the playstyle model's prediction without touching the reported behavior."""
+        self.inferred_behavior = behavior
+        self.style_score = style_score
+
     def record_action(self, action_type, details):
         """Record a player action with timestamp."""
         self.last_action = {
             "type": action_type,
             "details": details,
             "timestamp": time.time()
-        }
\ No newline at end of file
+        }
+        self.mark_dirty("actions")
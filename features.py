@@ -0,0 +1,145 @@
+import logging
+
+def analyze_movement(key_states):
+    """Analyze movement patterns from key states."""
+    movement_type = 'stationary'
+
+    if not key_states:
+        return movement_type
+
+    # Convert key states to set for easier checking
+    keys = set(key_states)
+
+    # Movement pattern analysis
+    if 'w' in keys and 'shift' in keys:
+        movement_type = 'rushing'
+    elif 'w' in keys and 'ctrl' in keys:
+        movement_type = 'sneaking'
+    elif len(keys.intersection({'w', 'a', 's', 'd'})) > 1:
+        movement_type = 'strafing'
+    elif len(keys.intersection({'w', 'a', 's', 'd'})) == 1:
+        movement_type = 'direct_movement'
+
+    return movement_type
+
+def analyze_tactics(game_state):
+    """Analyze tactical decisions from game state."""
+    tactical_profile = {
+        'aggression_level': 0,  # 0-1 scale
+        'positioning': 'unknown',
+        'objective_focus': 0  # 0-1 scale
+    }
+
+    try:
+        # Analyze aggression level based on actions and state
+        player = game_state.get('player', {})
+        actions = game_state.get('actions', {})
+
+        # Calculate aggression based on multiple factors
+        aggression_factors = []
+
+        # Weapon usage
+        weapon = player.get('weapon', {})
+        if weapon.get('shots_fired', 0) > 0:
+            aggression_factors.append(0.7)
+            logging.debug("Aggressive behavior detected: Active weapon usage")
+
+        # Movement style
+        if actions.get('tactical', {}).get('sprinting', False):
+            aggression_factors.append(0.8)
+            logging.debug("Aggressive behavior detected: Sprinting")
+        elif actions.get('tactical', {}).get('crouching', False):
+            aggression_factors.append(0.3)
+            logging.debug("Defensive behavior detected: Crouching")
+
+        # Position relative to cover
+        if game_state.get('environment', {}).get('in_cover', False):
+            aggression_factors.append(0.2)
+            tactical_profile['positioning'] = 'defensive'
+            logging.debug("Defensive positioning: In cover")
+        else:
+            tactical_profile['positioning'] = 'aggressive'
+            logging.debug("Aggressive positioning: Out of cover")
+
+        # Calculate average aggression
+        if aggression_factors:
+            tactical_profile['aggression_level'] = sum(aggression_factors) / len(aggression_factors)
+
+        # Analyze objective focus
+        if game_state.get('game', {}).get('objectives_completed', 0) > 0:
+            tactical_profile['objective_focus'] = 0.7
+            logging.debug("High objective focus detected")
+
+    except Exception as e:
+        logging.warning(f"Error in tactical analysis: {str(e)}")
+
+    return tactical_profile
+
+# Behavior labels in class index order
+BEHAVIOR_LABELS = ("defensive", "neutral", "aggressive")
+
+FEATURE_NAMES = (
+    "health",
+    "ammo_ratio",
+    "accuracy",
+    "recoil_control",
+    "target_acquisition_time",
+    "zombies_alive",
+    "threat_level",
+    "in_cover",
+    "sprinting",
+    "crouching",
+    "decision_quality",
+    "reaction_time",
+    "positioning_score",
+    "movement_keys",
+    "shooting"
+)
+
+def extract_feature_vector(entry):
+    """Extract the numeric ML feature vector (in FEATURE_NAMES order) from a log entry."""
+    game_state = entry.get('game_state', {})
+    player = game_state.get('player', {})
+    weapon = player.get('weapon', {})
+    ammo = weapon.get('ammo', {})
+    game = game_state.get('game', {})
+    environment = game_state.get('environment', {})
+    actions = game_state.get('actions', {})
+    tactical = actions.get('tactical', {})
+    input_data = entry.get('input_data', {})
+
+    ammo_total = ammo.get('current', 0) + ammo.get('reserve', 0)
+    threat_levels = game.get('zombies', {}).get('threat_levels', [])
+    keys = set(input_data.get('keyboard', []))
+
+    return [
+        player.get('health', 0) / 100,
+        ammo.get('current', 0) / ammo_total if ammo_total else 0.0,
+        weapon.get('accuracy', 0),
+        weapon.get('recoil_control', 0),
+        weapon.get('target_acquisition_time', 0),
+        game.get('zombies', {}).get('alive', 0),
+        sum(threat_levels) / len(threat_levels) if threat_levels else 0.0,
+        float(environment.get('in_cover', False)),
+        float(tactical.get('sprinting', False)),
+        float(tactical.get('crouching', False)),
+        tactical.get('decision_quality', 0),
+        tactical.get('reaction_time', 0),
+        actions.get('strategy_metrics', {}).get('positioning_score', 0),
+        len(keys.intersection({'w', 'a', 's', 'd'})),
+        float('left' in input_data.get('mouse_buttons', []))
+    ]
+
+def extract_behavior_label(entry):
+    """
+    Return the class index of the reported behavior, or None if there is none.
+
+    Only behavior set through DataCollector.update_behavior is a label. The
+    playstyle model's prediction is logged separately as "inferred", so it
+    never feeds back into training.
+    """
+    behavior = entry.get('game_state', {}).get('player', {}).get('behavior', {})
+    if not behavior.get('labeled'):
+        return None
+    current = behavior.get('current')
+    return BEHAVIOR_LABELS.index(current) if current in BEHAVIOR_LABELS else None
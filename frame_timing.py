@@ -0,0 +1,105 @@
+import bisect
+import numpy as np
+from config import FRAME_TIMING_SETTINGS
+from ring_buffer import RingBuffer
+from utils import calculate_fps
+
+class FrameTimer:
+    """
+    Per-tick interval telemetry in a fixed-size NumPy ring.
+
+    Rolling FPS and the jitter histogram are updated in O(1) per tick;
+    percentile lows are computed with a partial sort only when stats are
+    reported (once per round), so their cost is amortized over the round.
+    """
+
+    def __init__(self, target_frequency, capacity=FRAME_TIMING_SETTINGS["window"],
+                 jitter_bins_ms=FRAME_TIMING_SETTINGS["jitter_bins_ms"]):
+        self.target_interval = 1.0 / target_frequency
+        self.intervals = RingBuffer(capacity)
+        self.bins = np.zeros(capacity, dtype=np.int32)  # Jitter bin of each stored interval
+        self.last_tick = None
+
+        # Histogram of |interval - target| in ms over the rolling window
+        self.jitter_edges = [edge / 1000 for edge in jitter_bins_ms]
+        self.jitter_labels = self._bin_labels(jitter_bins_ms)
+        self.histogram = np.zeros(len(self.jitter_edges) + 1, dtype=np.int64)
+
+        self.reset_round()
+
+    @staticmethod
+    def _bin_labels(edges):
+        labels = [f"<{edges[0]}ms"]
+        labels += [f"{low}-{high}ms" for low, high in zip(edges, edges[1:])]
+        labels.append(f">={edges[-1]}ms")
+        return labels
+
+    def reset_round(self):
+        """Start accumulating a new round."""
+        self.round_count = 0
+        self.round_total = 0.0
+        self.round_total_sq = 0.0
+        self.round_max = 0.0
+        self.round_histogram = np.zeros(len(self.jitter_edges) + 1, dtype=np.int64)
+
+    def tick(self, now):
+        """Record the start of a tick (perf_counter seconds)."""
+        if self.last_tick is not None:
+            self.add_interval(now - self.last_tick)
+        self.last_tick = now
+
+    def add_interval(self, interval):
+        """Add one tick interval in seconds."""
+        jitter_bin = bisect.bisect_right(self.jitter_edges, abs(interval - self.target_interval))
+
+        if self.intervals.full:
+            self.histogram[self.bins[self.intervals.index]] -= 1
+        slot = self.intervals.append(interval)
+        self.bins[slot] = jitter_bin
+        self.histogram[jitter_bin] += 1
+
+        self.round_count += 1
+        self.round_total += interval
+        self.round_total_sq += interval * interval
+        self.round_max = max(self.round_max, interval)
+        self.round_histogram[jitter_bin] += 1
+
+    def fps(self):
+        """Rolling FPS over the window."""
+        total = self.intervals.total
+        return self.intervals.count / total if total > 0 else 0
+
+    def rolling_stats(self):
+        """Rolling FPS and jitter histogram over the window."""
+        return {
+            "fps": round(self.fps(), 2),
+            "jitter_histogram": dict(zip(self.jitter_labels, self.histogram.tolist()))
+        }
+
+    def _low_fps(self, intervals, fraction):
+        """Average FPS over the slowest `fraction` of frames."""
+        worst = max(1, int(len(intervals) * fraction))
+        slowest = np.partition(intervals, len(intervals) - worst)[-worst:]
+        return calculate_fps(slowest)
+
+    def round_stats(self):
+        """Summarize the current round."""
+        if self.round_count == 0:
+            return None
+
+        mean = self.round_total / self.round_count
+        variance = max(0.0, self.round_total_sq / self.round_count - mean * mean)
+        recent = self.intervals.recent(self.round_count)
+
+        return {
+            "frames": self.round_count,
+            "fps": round(1.0 / mean if mean > 0 else 0, 2),
+            "avg_frame_ms": round(mean * 1000, 3),
+            "max_frame_ms": round(self.round_max * 1000, 3),
+            "jitter_ms": round(variance ** 0.5 * 1000, 3),
+            "low_1pct_fps": round(self._low_fps(recent, 0.01), 2),
+            "low_0_1pct_fps": round(self._low_fps(recent, 0.001), 2),
+            # Lows cover at most the last `window` frames of long rounds
+            "lows_window_frames": len(recent),
+            "jitter_histogram": dict(zip(self.jitter_labels, self.round_histogram.tolist()))
+        }
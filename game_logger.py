@@ -1,16 +1,26 @@
 #!/usr/bin/env python3
-import json
 import time
+
+# Reference point for measuring how long it takes until capture begins
+LAUNCH_TIME = time.perf_counter()
+
+import json
 from datetime import datetime
 from input_tracker import InputTracker
 from data_collector import DataCollector
-from ml_trainer import GameplayLearner
+from memory_reader import create_memory_reader
+from rollups import RollupStore
+from catalog import SessionCatalog
+from tick_budget import TickBudget
+from resource_monitor import ResourceMonitor
+from config import LOG_SETTINGS, BUDGET_SETTINGS, PLAYSTYLE_SETTINGS, MEMORY_SETTINGS
 from utils import performance_monitor
 import logging
 import os
 import sys
 import platform
 import ctypes
+from threading import Event, Lock, Thread
 
 # Set up detailed logging
 logging.basicConfig(
@@ -25,17 +35,68 @@ logging.basicConfig(
 class GameLogger:
     def __init__(self):
         self.input_tracker = InputTracker()
+        # The game is attached to in the background once logging starts
         self.data_collector = DataCollector()
-        self.gameplay_learner = GameplayLearner()
+        self.memory_attach_stop = Event()
+        self._gameplay_learner = None
+        self.rollups = RollupStore()
+        self.catalog = None
+        self.resource_monitor = None
+        self.frame_timer = None
+        self.playstyle_classifier = None
+        self.current_round = None
+        self.round_frame_stats = []
         self.is_running = False
         self.session_start = None
+        self.capture_started = None  # perf_counter time of the first captured entry
         self.current_log = []
+        # Guards the log buffer, rollups and catalog, since stop_logging may
+        # run on a different thread than the logging loop
+        self.log_lock = Lock()
         self.last_analysis_time = time.time()
         self.analysis_interval = 300  # Analyze every 5 minutes
+        self.statistics_enabled = True
+        self.tick_budget = self._create_tick_budget()
 
         # Log system info for debugging
         self._log_system_info()
 
+    def _create_tick_budget(self):
+        """Set up the tick budget with optional work in the order it is shed."""
+        tick_budget = TickBudget(
+            LOG_SETTINGS["frequency"],
+            overload_ratio=BUDGET_SETTINGS["overload_ratio"],
+            recovery_ratio=BUDGET_SETTINGS["recovery_ratio"]
+        )
+        environment_interval = self.data_collector.collectors["environment"].interval
+
+        def skip_statistics():
+            self.statistics_enabled = False
+
+        def log_statistics():
+            self.statistics_enabled = True
+
+        tick_budget.add_step("statistics", skip_statistics, log_statistics)
+        tick_budget.add_step(
+            "environment_rate",
+            lambda: self.data_collector.set_interval("environment", BUDGET_SETTINGS["degraded_environment_interval"]),
+            lambda: self.data_collector.set_interval("environment", environment_interval)
+        )
+        tick_budget.add_step(
+            "mouse_samples",
+            lambda: self.input_tracker.set_mouse_poll_interval(BUDGET_SETTINGS["degraded_mouse_poll_ticks"]),
+            lambda: self.input_tracker.set_mouse_poll_interval(1)
+        )
+        return tick_budget
+
+    @property
+    def gameplay_learner(self):
+        """Created on first use, since importing ml_trainer pulls in pandas and numpy."""
+        if self._gameplay_learner is None:
+            from ml_trainer import GameplayLearner
+            self._gameplay_learner = GameplayLearner()
+        return self._gameplay_learner
+
     def _log_system_info(self):
         """Log system information for debugging purposes."""
         logging.info(f"Operating System: {platform.system()} {platform.release()}")
@@ -75,30 +136,114 @@ class GameLogger:
                 os.makedirs('game_logs')
                 logging.info("Created game_logs directory")
 
-            # Start input tracking (will run in limited mode if no admin privileges)
-            self.input_tracker.start()
+            self.catalog = SessionCatalog()
 
-            if not self.input_tracker.input_tracking_available:
-                if platform.system() == 'Windows':
-                    logging.warning("⚠️ Running with limited functionality - administrator privileges required")
-                    logging.info("To enable full functionality, run 'run_logger.bat' as administrator")
-                else:
-                    logging.warning("⚠️ Running with limited functionality - input tracking disabled")
-                    logging.info("To enable full functionality, run the script with root privileges")
-            else:
-                logging.info("✅ Input tracking successfully initialized")
+            session_id = self.session_start.strftime('%Y%m%d_%H%M%S')
+            self.resource_monitor = ResourceMonitor(f"game_logs/metrics_{session_id}.csv")
+            self.resource_monitor.start()
+
+            # The game is often started after the logger, so keep looking for it
+            if MEMORY_SETTINGS["enabled"]:
+                self.memory_attach_stop.clear()
+                Thread(target=self._attach_memory_reader, name="MemoryAttach", daemon=True).start()
+
+            # Frame timing needs numpy, which is loaded off the startup path
+            Thread(target=self._start_frame_timer, name="FrameTimerInit", daemon=True).start()
+            if PLAYSTYLE_SETTINGS["enabled"]:
+                Thread(target=self._start_playstyle_classifier, name="PlaystyleInit", daemon=True).start()
+
+            # Start input tracking (will run in limited mode if no admin privileges).
+            # Hooks are installed in the background so capture starts right away.
+            self.input_tracker.start_in_background(on_ready=self._report_input_tracking)
 
             self._main_loop()
         except Exception as e:
             logging.error(f"Critical error in logging session: {str(e)}", exc_info=True)
             self.stop_logging()
 
+    def _start_frame_timer(self):
+        """Create the frame timer; ticks are recorded once it is available."""
+        try:
+            from frame_timing import FrameTimer
+            self.frame_timer = FrameTimer(LOG_SETTINGS["frequency"])
+        except Exception as e:
+            logging.error(f"Could not start frame timing: {str(e)}", exc_info=True)
+
+    def _start_playstyle_classifier(self):
+        """Load the live playstyle classifier; behavior is inferred once it is available."""
+        try:
+            from playstyle import StreamingPlaystyleClassifier
+            self.playstyle_classifier = StreamingPlaystyleClassifier.from_model_store()
+        except Exception as e:
+            logging.error(f"Could not start playstyle inference: {str(e)}", exc_info=True)
+
+    def _attach_memory_reader(self):
+        """Attach to the game process, retrying until it is found or logging stops."""
+        interval = MEMORY_SETTINGS["attach_interval"]
+        logging.info(f"Looking for game process {MEMORY_SETTINGS['process_name']}, using mock game state until found")
+        while not self.memory_attach_stop.is_set():
+            try:
+                reader = create_memory_reader()
+            except Exception as e:
+                logging.error(f"Error attaching to game process: {str(e)}", exc_info=True)
+                reader = None
+
+            if reader is not None:
+                # stop_logging detaches under the same lock, so a late attach is not leaked
+                with self.log_lock:
+                    if self.is_running:
+                        self.data_collector.memory_reader = reader
+                        return
+                reader.close()
+                return
+            self.memory_attach_stop.wait(interval)
+
+    def _log_frame_timing(self):
+        """Log and store frame timing stats for the round that just ended."""
+        stats = self.frame_timer.round_stats() if self.frame_timer else None
+        if stats is None:
+            return
+
+        stats["round"] = self.current_round
+        self.round_frame_stats.append(stats)
+        logging.info(
+            f"Round {self.current_round} frame timing - FPS: {stats['fps']:.1f}, "
+            f"1% low: {stats['low_1pct_fps']:.1f}, 0.1% low: {stats['low_0_1pct_fps']:.1f}, "
+            f"Jitter: {stats['jitter_ms']:.2f}ms, Max frame: {stats['max_frame_ms']:.1f}ms"
+        )
+        self.frame_timer.reset_round()
+
+    def _report_input_tracking(self):
+        """Log whether input tracking could be started."""
+        if not self.input_tracker.input_tracking_available:
+            if platform.system() == 'Windows':
+                logging.warning("⚠️ Running with limited functionality - administrator privileges required")
+                logging.info("To enable full functionality, run 'run_logger.bat' as administrator")
+            else:
+                logging.warning("⚠️ Running with limited functionality - input tracking disabled")
+                logging.info("To enable full functionality, run the script with root privileges")
+        else:
+            logging.info("✅ Input tracking successfully initialized")
+
     def stop_logging(self):
         """Stop the logging session and save data."""
         try:
             self.is_running = False
+            self.memory_attach_stop.set()
             self.input_tracker.stop()
-            self._save_logs()
+            if self.resource_monitor:
+                self.resource_monitor.stop()
+            with self.log_lock:
+                memory_reader = self.data_collector.memory_reader
+                self.data_collector.memory_reader = None
+                self._save_logs(final=True)
+                if self.catalog:
+                    self.catalog.close()
+                    self.catalog = None
+            if memory_reader:
+                memory_reader.close()
+            self._log_frame_timing()
+            self._save_session_metadata()
             logging.info("=== Logging session stopped ===")
             if self.session_start:
                 duration = datetime.now() - self.session_start
@@ -115,46 +260,87 @@ class GameLogger:
 
         while self.is_running:
             try:
-                loop_start = time.time()
+                loop_start = time.perf_counter()
+
+                # Record the tick interval
+                if self.frame_timer:
+                    self.frame_timer.tick(loop_start)
+                timed = time.perf_counter()
 
                 # Collect current game state
                 game_state = self.data_collector.get_game_state()
+                collected = time.perf_counter()
+
+                # Frame timing is reported per round
+                round_number = game_state["game"]["round"]
+                if round_number != self.current_round:
+                    self._log_frame_timing()
+                    self.current_round = round_number
 
                 # Get input data (will be empty if input tracking is disabled)
                 input_data = self.input_tracker.get_current_input_state()
+                input_done = time.perf_counter()
 
                 # Combine data
                 log_entry = {
                     "timestamp": time.time(),
                     "game_state": game_state,
+                    "unchanged_sections": self.data_collector.unchanged_sections,
                     "input_data": input_data
                 }
 
-                self.current_log.append(log_entry)
-
-                # Performance monitoring
-                loop_duration = time.time() - loop_start
-                if loop_duration > 0.020:  # More than 50fps
-                    logging.warning(f"Loop took longer than expected: {loop_duration:.3f}s")
-
-                # Save periodically (every 1000 entries or 60 seconds)
-                if len(self.current_log) >= 1000 or (time.time() - last_save_time) > 60:
-                    self._save_logs()
-                    self.current_log = []
+                with self.log_lock:
+                    # Entries captured after the final save would be lost or written twice
+                    if not self.is_running:
+                        break
+                    self.current_log.append(log_entry)
+                    # Fold into the rollups now so the cost is spread across ticks
+                    self.rollups.add_entry(log_entry)
+
+                if loop_iterations == 0:
+                    self.capture_started = time.perf_counter()
+                    startup_ms = (self.capture_started - LAUNCH_TIME) * 1000
+                    logging.info(f"Capture started {startup_ms:.1f}ms after launch")
+                buffered_entry = time.perf_counter()
+
+                # Infer playstyle from the recent window; feeds the next tick's state
+                if self.playstyle_classifier:
+                    behavior, style_score = self.playstyle_classifier.update(log_entry)
+                    self.data_collector.update_inferred_behavior(behavior, style_score)
+                classified = time.perf_counter()
+
+                # Save periodically (every batch_size entries or 60 seconds)
+                if len(self.current_log) >= LOG_SETTINGS["batch_size"] or (time.time() - last_save_time) > 60:
+                    with self.log_lock:
+                        self._save_logs()
                     last_save_time = time.time()
+                buffered = time.perf_counter()
 
                 # Periodic gameplay analysis
                 current_time = time.time()
                 if current_time - self.last_analysis_time > self.analysis_interval:
                     self._analyze_gameplay()
                     self.last_analysis_time = current_time
+                analyzed = time.perf_counter()
 
-                # Log statistics every 1000 iterations
+                # Log statistics every 1000 iterations (shed first when over budget)
                 loop_iterations += 1
-                if loop_iterations % 1000 == 0:
+                if loop_iterations % 1000 == 0 and self.statistics_enabled:
                     self._log_statistics(game_state)
+                loop_end = time.perf_counter()
 
-                time.sleep(max(0, 0.016 - loop_duration))  # Target ~60 FPS
+                # Track stage costs and shed or restore optional work
+                self.tick_budget.end_tick({
+                    "frames": timed - loop_start,
+                    "collect": collected - timed,
+                    "input": input_done - collected,
+                    "buffer": (buffered_entry - input_done) + (buffered - classified),
+                    "classify": classified - buffered_entry,
+                    "analysis": analyzed - buffered,
+                    "stats": loop_end - analyzed
+                })
+
+                time.sleep(max(0, self.tick_budget.budget - (loop_end - loop_start)))
 
             except Exception as e:
                 logging.error(f"Error in main loop: {str(e)}", exc_info=True)
@@ -206,24 +392,78 @@ class GameLogger:
             logging.info(f"Current Weapon: {game_state['player']['weapon']['name']}")
             if game_state['game']['power_ups']['active']:
                 logging.info(f"Active Power-up: {game_state['game']['power_ups']['active']}")
+            if self.frame_timer:
+                frame_stats = self.frame_timer.rolling_stats()
+                logging.info(f"Rolling FPS: {frame_stats['fps']:.1f}, Jitter: {frame_stats['jitter_histogram']}")
+            if self.playstyle_classifier:
+                playstyle = self.playstyle_classifier.summary()
+                logging.info(
+                    f"Playstyle: {self.playstyle_classifier.behavior} "
+                    f"(style score {self.playstyle_classifier.style_score:.2f}), "
+                    f"inference avg {playstyle['avg_latency_ms']:.3f}ms, max {playstyle['max_latency_ms']:.3f}ms"
+                )
         except Exception as e:
             logging.error(f"Error logging statistics: {str(e)}")
 
-    def _save_logs(self):
-        """Save collected logs to file."""
-        if not self.current_log:
+    def _save_session_metadata(self):
+        """Save session-level metadata such as tick costs and degradation events."""
+        if self.session_start is None:
             return
 
+        session_id = self.session_start.strftime('%Y%m%d_%H%M%S')
+        filename = f"game_logs/session_{session_id}.json"
+        try:
+            with open(filename, 'w') as f:
+                json.dump({
+                    'session_id': session_id,
+                    'start_time': self.session_start.timestamp(),
+                    'end_time': time.time(),
+                    'frequency': LOG_SETTINGS["frequency"],
+                    'metrics_file': self.resource_monitor.filename if self.resource_monitor else None,
+                    'tick_budget': self.tick_budget.summary(),
+                    'frame_timing': self.round_frame_stats,
+                    'playstyle': self.playstyle_classifier.summary() if self.playstyle_classifier else None
+                }, f, indent=2)
+            logging.info(f"Session metadata saved to {filename}")
+        except Exception as e:
+            logging.error(f"Error saving session metadata to {filename}: {str(e)}", exc_info=True)
+
+    def _save_logs(self, final=False):
+        """Save collected logs to file and update the session rollups. Call with log_lock held."""
         if self.session_start is None:
             self.session_start = datetime.now()
 
-        filename = f"game_logs/game_logs_{self.session_start.strftime('%Y%m%d_%H%M%S')}.json"
+        session_id = self.session_start.strftime('%Y%m%d_%H%M%S')
+        rollup_file = f"game_logs/rollups_{session_id}.jsonl"
+
+        # Take the batch so it is written at most once, even if the save fails
+        entries = self.current_log
+        self.current_log = []
+
+        try:
+            if entries:
+                self._write_log_segment(session_id, entries, rollup_file)
+        finally:
+            # Entries were folded into the rollups as they were captured, so
+            # the rollups also cover a batch whose write failed and can then
+            # count more samples than the raw log holds
+            self.rollups.flush(rollup_file, final=final)
+
+    def _write_log_segment(self, session_id, entries, rollup_file):
+        """Append a batch to the session log and record its location in the catalog."""
+        filename = f"game_logs/game_logs_{session_id}.json"
         try:
+            offset = os.path.getsize(filename) if os.path.exists(filename) else 0
             with open(filename, 'a') as f:
-                json.dump(self.current_log, f)
-            logging.info(f"✅ Logs saved to {filename} ({len(self.current_log)} entries)")
+                json.dump(entries, f)
+            length = os.path.getsize(filename) - offset
+            logging.info(f"✅ Logs saved to {filename} ({len(entries)} entries)")
         except Exception as e:
             logging.error(f"Error saving logs to {filename}: {str(e)}", exc_info=True)
+            return
+
+        if self.catalog:
+            self.catalog.record_segment(session_id, filename, offset, length, entries, rollup_file)
 
 if __name__ == "__main__":
     logger = GameLogger()
@@ -1,11 +1,22 @@
-import keyboard
 import logging
 import os
 import sys
-from threading import Lock
-import mouse
+from threading import Lock, Thread
 import ctypes
 
+# keyboard and mouse take tens of milliseconds to import, so they are loaded
+# when tracking starts rather than at module import
+keyboard = None
+mouse = None
+
+def _load_input_modules():
+    """Import the keyboard and mouse modules on first use."""
+    global keyboard, mouse
+    if keyboard is None:
+        import keyboard as keyboard_module
+        import mouse as mouse_module
+        keyboard, mouse = keyboard_module, mouse_module
+
 class InputTracker:
     def __init__(self):
         self.lock = Lock()
@@ -14,10 +25,15 @@ class InputTracker:
         self.mouse_buttons = set()
         self.is_tracking = False
         self.input_tracking_available = True
-        self._check_privileges()
+        self.privileges_checked = False
+        self.mouse_poll_interval = 1
+        self.mouse_poll_counter = 0
+        self.start_thread = None
+        self.stopping = False
 
     def _check_privileges(self):
         """Check if we have necessary privileges for input tracking."""
+        self.privileges_checked = True
         try:
             if sys.platform.startswith('win32'):
                 is_admin = ctypes.windll.shell32.IsUserAnAdmin()
@@ -27,15 +43,8 @@ class InputTracker:
                     return False
                 logging.info("Running with administrator privileges")
                 return True
-            elif sys.platform.startswith('linux'):
-                try:
-                    keyboard.on_press(lambda _: None)
-                    keyboard.unhook_all()
-                    return True
-                except Exception as e:
-                    logging.warning(f"Input tracking requires root privileges on Linux: {str(e)}")
-                    self.input_tracking_available = False
-                    return False
+            # On Linux the hooks installed by start() double as the privilege
+            # check, rather than installing and removing a probe hook first
             return True
         except Exception as e:
             logging.error(f"Error checking privileges: {str(e)}")
@@ -44,30 +53,74 @@ class InputTracker:
 
     def start(self):
         """Start tracking keyboard and mouse inputs if available."""
+        self.stopping = False
+        self._start_hooks()
+
+    def _start_hooks(self):
+        """Install the input hooks unless stop() is called first."""
+        if not self.privileges_checked:
+            self._check_privileges()
+
         if not self.input_tracking_available:
             logging.warning("Input tracking is disabled. Game state will still be logged.")
             return
 
         try:
+            _load_input_modules()
+
             # Set up keyboard hooks
             keyboard.on_press(self._on_key_press)
             keyboard.on_release(self._on_key_release)
             logging.info("Keyboard tracking initialized successfully")
 
-            # Set up mouse hooks
-            mouse.on_click(self._on_mouse_click)
-            mouse.on_move(self._on_mouse_move)
+            # Set up mouse hooks; one hook sees both button and move events
+            mouse.hook(self._on_mouse_event)
             logging.info("Mouse tracking initialized successfully")
 
-            self.is_tracking = True
+            # stop() may have run while the hooks were being installed
+            with self.lock:
+                if not self.stopping:
+                    self.is_tracking = True
+            if not self.is_tracking:
+                keyboard.unhook_all()
+                mouse.unhook_all()
+                logging.info("Input tracking stopped before it finished starting")
+                return
+
             logging.info("Input tracking started successfully")
 
         except Exception as e:
-            logging.error(f"Failed to initialize input tracking: {str(e)}")
+            if sys.platform.startswith('linux'):
+                logging.warning(f"Input tracking requires root privileges on Linux: {str(e)}")
+            else:
+                logging.error(f"Failed to initialize input tracking: {str(e)}")
             self.input_tracking_available = False
 
+    def set_mouse_poll_interval(self, ticks):
+        """Poll the mouse position only every `ticks` calls, reusing the last sample in between."""
+        with self.lock:
+            self.mouse_poll_interval = max(1, ticks)
+            self.mouse_poll_counter = 0
+
+    def start_in_background(self, on_ready=None):
+        """Start tracking on a background thread so capture does not wait for the hooks."""
+        def run():
+            self._start_hooks()
+            if on_ready and not self.stopping:
+                on_ready()
+
+        self.stopping = False
+        self.start_thread = Thread(target=run, name="InputTrackerStart", daemon=True)
+        self.start_thread.start()
+
     def stop(self):
-        """Stop tracking inputs."""
+        """Stop tracking inputs, including hooks still being installed in the background."""
+        with self.lock:
+            self.stopping = True
+        if self.start_thread is not None:
+            self.start_thread.join(timeout=2)
+            self.start_thread = None
+
         if self.is_tracking:
             try:
                 keyboard.unhook_all()
@@ -87,21 +140,21 @@ class InputTracker:
         with self.lock:
             self.current_keys.discard(event.name)
 
-    def _on_mouse_click(self, event):
-        """Handle mouse click events."""
-        with self.lock:
-            if hasattr(event, 'button'):
-                self.mouse_buttons.add(event.button)
-
-    def _on_mouse_move(self, event):
-        """Handle mouse movement events."""
+    def _on_mouse_event(self, event):
+        """Handle mouse button and movement events."""
         with self.lock:
-            if hasattr(event, 'x') and hasattr(event, 'y'):
+            if isinstance(event, mouse.ButtonEvent):
+                # Buttons are tracked while held, like keys
+                if event.event_type == mouse.UP:
+                    self.mouse_buttons.discard(event.button)
+                else:
+                    self.mouse_buttons.add(event.button)
+            elif isinstance(event, mouse.MoveEvent):
                 self.mouse_position = (event.x, event.y)
 
     def get_current_input_state(self):
         """Return the current state of all inputs."""
-        if not self.input_tracking_available:
+        if not self.input_tracking_available or not self.is_tracking:
             return {
                 "keyboard": [],
                 "mouse_position": (0, 0),
@@ -111,12 +164,15 @@ class InputTracker:
 
         with self.lock:
             try:
-                # Get current mouse position even if tracking is disabled
-                try:
-                    current_pos = mouse.get_position()
-                    self.mouse_position = current_pos
-                except Exception as e:
-                    logging.error(f"Failed to get mouse position: {str(e)}")
+                # Poll the mouse position, coalescing samples when the interval is raised
+                self.mouse_poll_counter += 1
+                if self.mouse_poll_counter >= self.mouse_poll_interval:
+                    self.mouse_poll_counter = 0
+                    try:
+                        current_pos = mouse.get_position()
+                        self.mouse_position = current_pos
+                    except Exception as e:
+                        logging.error(f"Failed to get mouse position: {str(e)}")
 
                 return {
                     "keyboard": list(self.current_keys),
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+from catalog import DEFAULT_CATALOG_PATH, SessionCatalog
+from features import BEHAVIOR_LABELS
+
+def labels_path(log_directory, session_id):
+    """Return the sidecar file holding a session's behavior labels."""
+    return Path(log_directory) / f'labels_{session_id}.jsonl'
+
+def add_label(log_directory, session_id, behavior, start=None, end=None):
+    """
+    Label the ticks of a session between two timestamps (inclusive; None is
+    open-ended) with a behavior. Later labels override earlier ones.
+    """
+    if behavior not in BEHAVIOR_LABELS:
+        raise ValueError(f"Unknown behavior {behavior!r}, expected one of {', '.join(BEHAVIOR_LABELS)}")
+    with open(labels_path(log_directory, session_id), 'a') as f:
+        f.write(json.dumps({"behavior": behavior, "start": start, "end": end}) + "\n")
+
+def round_range(catalog, session_id, first_round, last_round):
+    """Return the (start, end) timestamps covering a range of a session's rounds."""
+    rounds = [r for r in catalog.find_rounds(session_id, min_round=first_round) if r['round'] <= last_round]
+    if not rounds:
+        raise ValueError(f"Session {session_id} has no rounds between {first_round} and {last_round}")
+    return min(r['start_time'] for r in rounds), max(r['end_time'] for r in rounds)
+
+class SessionLabels:
+    """Behavior labels of one session, looked up by tick timestamp."""
+
+    def __init__(self, ranges=()):
+        # (start, end, class index) in the order they were added
+        self.ranges = list(ranges)
+
+    @classmethod
+    def load(cls, log_directory, session_id):
+        path = labels_path(log_directory, session_id)
+        ranges = []
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        ranges.append((record["start"], record["end"], BEHAVIOR_LABELS.index(record["behavior"])))
+        return cls(ranges)
+
+    def label_at(self, timestamp):
+        """Return the class index labeled at a timestamp (latest label wins), or None."""
+        for start, end, label in reversed(self.ranges):
+            if (start is None or timestamp >= start) and (end is None or timestamp <= end):
+                return label
+        return None
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Label the playstyle of a logged session for training")
+    parser.add_argument("session_id", help="Session to label, e.g. 20240101_120000")
+    parser.add_argument("behavior", choices=BEHAVIOR_LABELS)
+    parser.add_argument("--rounds", type=int, nargs=2, metavar=("FIRST", "LAST"),
+                        help="Only label these rounds (inclusive); default is the whole session")
+    parser.add_argument("--log-directory", default="game_logs")
+    args = parser.parse_args()
+
+    start = end = None
+    if args.rounds:
+        catalog = SessionCatalog(os.path.join(args.log_directory, os.path.basename(DEFAULT_CATALOG_PATH)))
+        try:
+            start, end = round_range(catalog, args.session_id, *args.rounds)
+        except ValueError as e:
+            logging.error(str(e))
+            sys.exit(1)
+        finally:
+            catalog.close()
+
+    add_label(args.log_directory, args.session_id, args.behavior, start, end)
+    scope = f"rounds {args.rounds[0]}-{args.rounds[1]}" if args.rounds else "the whole session"
+    logging.info(f"Labeled {scope} of session {args.session_id} as {args.behavior}")
@@ -0,0 +1,371 @@
+import ctypes
+import logging
+import os
+import struct
+import sys
+import time
+from config import MEMORY_SETTINGS
+from utils import find_process
+
+class MemoryReadError(Exception):
+    """Raised when a region of the target process cannot be read."""
+
+class MemoryBackend:
+    """Base class for reading memory of a target process."""
+
+    def __init__(self):
+        self.read_calls = 0
+
+    def read(self, address, size):
+        """Read size bytes at address."""
+        raise NotImplementedError
+
+    def read_many(self, regions):
+        """
+        Read a list of (address, size) regions and return their bytes.
+        Backends that support scatter reads override this to use one call.
+        """
+        return [self.read(address, size) for address, size in regions]
+
+    def close(self):
+        pass
+
+class ProcMemBackend(MemoryBackend):
+    """Linux backend using process_vm_readv, falling back to /proc/<pid>/mem."""
+
+    IOV_MAX = 1024
+
+    class _IOVec(ctypes.Structure):
+        _fields_ = [("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t)]
+
+    def __init__(self, pid):
+        super().__init__()
+        self.pid = pid
+        self.fd = None
+        self._readv = None
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            readv = libc.process_vm_readv
+            readv.argtypes = [
+                ctypes.c_int, ctypes.POINTER(self._IOVec), ctypes.c_ulong,
+                ctypes.POINTER(self._IOVec), ctypes.c_ulong, ctypes.c_ulong
+            ]
+            readv.restype = ctypes.c_ssize_t
+            self._readv = readv
+        except (OSError, AttributeError):
+            logging.info("process_vm_readv unavailable, using /proc/<pid>/mem")
+
+    def _mem_fd(self):
+        if self.fd is None:
+            try:
+                self.fd = os.open(f"/proc/{self.pid}/mem", os.O_RDONLY)
+            except OSError as e:
+                raise MemoryReadError(f"Cannot open memory of process {self.pid}: {str(e)}")
+        return self.fd
+
+    def read(self, address, size):
+        return self.read_many([(address, size)])[0]
+
+    def read_many(self, regions):
+        if self._readv is None:
+            return self._pread_many(regions)
+
+        results = []
+        for start in range(0, len(regions), self.IOV_MAX):
+            results.extend(self._readv_batch(regions[start:start + self.IOV_MAX]))
+        return results
+
+    def _readv_batch(self, regions):
+        total = sum(size for _, size in regions)
+        buffer = ctypes.create_string_buffer(total)
+        local = (self._IOVec * len(regions))()
+        remote = (self._IOVec * len(regions))()
+
+        position = 0
+        buffer_address = ctypes.addressof(buffer)
+        for i, (address, size) in enumerate(regions):
+            local[i].iov_base = buffer_address + position
+            local[i].iov_len = size
+            remote[i].iov_base = address
+            remote[i].iov_len = size
+            position += size
+
+        self.read_calls += 1
+        count = self._readv(self.pid, local, len(regions), remote, len(regions), 0)
+        if count != total:
+            if count < 0 and ctypes.get_errno() == 38:  # ENOSYS
+                self._readv = None
+                return self._pread_many(regions)
+            raise MemoryReadError(
+                f"process_vm_readv read {count} of {total} bytes from process {self.pid} "
+                f"(errno {ctypes.get_errno()})"
+            )
+
+        raw = buffer.raw
+        results = []
+        position = 0
+        for _, size in regions:
+            results.append(raw[position:position + size])
+            position += size
+        return results
+
+    def _pread_many(self, regions):
+        fd = self._mem_fd()
+        results = []
+        for address, size in regions:
+            self.read_calls += 1
+            try:
+                data = os.pread(fd, size, address)
+            except OSError as e:
+                raise MemoryReadError(f"Failed to read {size} bytes at {address:#x}: {str(e)}")
+            if len(data) != size:
+                raise MemoryReadError(f"Short read of {len(data)}/{size} bytes at {address:#x}")
+            results.append(data)
+        return results
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+class Win32Backend(MemoryBackend):
+    """Windows backend using ReadProcessMemory."""
+
+    PROCESS_VM_READ = 0x0010
+    PROCESS_QUERY_INFORMATION = 0x0400
+
+    def __init__(self, pid):
+        super().__init__()
+        self.pid = pid
+        self.kernel32 = ctypes.windll.kernel32
+        self.handle = self.kernel32.OpenProcess(
+            self.PROCESS_VM_READ | self.PROCESS_QUERY_INFORMATION, False, pid
+        )
+        if not self.handle:
+            raise MemoryReadError(f"Cannot open process {pid} (error {self.kernel32.GetLastError()})")
+
+    def read(self, address, size):
+        buffer = ctypes.create_string_buffer(size)
+        bytes_read = ctypes.c_size_t(0)
+        self.read_calls += 1
+        ok = self.kernel32.ReadProcessMemory(
+            self.handle, ctypes.c_void_p(address), buffer, size, ctypes.byref(bytes_read)
+        )
+        if not ok or bytes_read.value != size:
+            raise MemoryReadError(f"Failed to read {size} bytes at {address:#x}")
+        return buffer.raw
+
+    def close(self):
+        if self.handle:
+            self.kernel32.CloseHandle(self.handle)
+            self.handle = None
+
+class FakeProcessImage(MemoryBackend):
+    """
+    File-backed stand-in for a game process.
+
+    The file holds a memory image mapped at base_address, so pointer chains
+    and struct layouts can be exercised without the game running.
+    """
+
+    def __init__(self, path, base_address=0, size=0):
+        super().__init__()
+        self.path = path
+        self.base_address = base_address
+        if not os.path.exists(path):
+            with open(path, 'wb') as f:
+                f.write(b"\0" * size)
+        self.file = open(path, 'r+b')
+
+    def read(self, address, size):
+        self.read_calls += 1
+        return self._read_region(address, size)
+
+    def read_many(self, regions):
+        # Behaves like a scatter read: one call for the whole batch
+        self.read_calls += 1
+        return [self._read_region(address, size) for address, size in regions]
+
+    def _read_region(self, address, size):
+        if address < self.base_address:
+            raise MemoryReadError(f"Address {address:#x} is below the image base")
+        self.file.seek(address - self.base_address)
+        data = self.file.read(size)
+        if len(data) != size:
+            raise MemoryReadError(f"Short read of {len(data)}/{size} bytes at {address:#x}")
+        return data
+
+    def write(self, address, data):
+        """Write raw bytes into the image, e.g. to simulate the game updating state."""
+        self.file.seek(address - self.base_address)
+        self.file.write(data)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+class StructLayout:
+    """Field layout of a struct in game memory, read as one contiguous region."""
+
+    def __init__(self, fields):
+        # fields: name -> (offset, struct format), e.g. {"health": (0x1C8, "i")}
+        self.fields = [
+            (name, offset, struct.Struct('<' + fmt)) for name, (offset, fmt) in fields.items()
+        ]
+        self.size = max((offset + s.size for _, offset, s in self.fields), default=0)
+
+    def unpack(self, data):
+        values = {}
+        for name, offset, field_struct in self.fields:
+            value = field_struct.unpack_from(data, offset)
+            values[name] = value[0] if len(value) == 1 else value
+        return values
+
+class _CachedAddress:
+    def __init__(self, address, pointer_address=None, pointer_value=None):
+        self.address = address
+        self.pointer_address = pointer_address
+        self.pointer_value = pointer_value
+        self.validated_at = time.time()
+
+class MemoryReader:
+    """
+    Reads game structs through a backend.
+
+    Pointer chains are resolved once and cached. Cached addresses are
+    revalidated by re-reading only the last pointer of each chain, and all
+    revalidations and struct reads of a tick are issued as batched reads.
+    """
+
+    def __init__(self, backend, pointer_size=4, revalidate_interval=1.0):
+        self.backend = backend
+        self.pointer_format = struct.Struct('<I' if pointer_size == 4 else '<Q')
+        self.revalidate_interval = revalidate_interval
+        self.structs = {}
+        self.address_cache = {}
+
+    def add_struct(self, name, base, offsets, layout, section=None):
+        """
+        Register a struct found by following a pointer chain.
+
+        The address is base + offsets[0], dereferenced, + offsets[1], ...
+        with the last offset added without a dereference.
+        """
+        if not isinstance(layout, StructLayout):
+            layout = StructLayout(layout)
+        self.structs[name] = {
+            "base": base,
+            "offsets": list(offsets) or [0],
+            "layout": layout,
+            "section": section or name
+        }
+        self.address_cache.pop(name, None)
+
+    def _read_pointer(self, address):
+        return self.pointer_format.unpack(self.backend.read(address, self.pointer_format.size))[0]
+
+    def resolve(self, name):
+        """Walk a struct's pointer chain and cache the final address."""
+        definition = self.structs[name]
+        address = definition["base"]
+        pointer_address = None
+        pointer_value = None
+        for offset in definition["offsets"][:-1]:
+            pointer_address = address + offset
+            pointer_value = self._read_pointer(pointer_address)
+            if pointer_value == 0:
+                raise MemoryReadError(f"Null pointer in chain for {name} at {pointer_address:#x}")
+            address = pointer_value
+        address += definition["offsets"][-1]
+
+        cached = _CachedAddress(address, pointer_address, pointer_value)
+        self.address_cache[name] = cached
+        return cached
+
+    def _revalidate(self, names):
+        """Re-resolve stale cache entries, checking all chains with one batched read."""
+        now = time.time()
+        to_check = []
+        for name in names:
+            cached = self.address_cache.get(name)
+            if cached is None:
+                self.resolve(name)
+            elif cached.pointer_address is not None and now - cached.validated_at >= self.revalidate_interval:
+                to_check.append((name, cached))
+
+        if not to_check:
+            return
+
+        pointer_size = self.pointer_format.size
+        pointers = self.backend.read_many([(c.pointer_address, pointer_size) for _, c in to_check])
+        for (name, cached), data in zip(to_check, pointers):
+            if self.pointer_format.unpack(data)[0] == cached.pointer_value:
+                cached.validated_at = now
+            else:
+                logging.info(f"Address of {name} moved, resolving pointer chain again")
+                self.resolve(name)
+
+    def read_structs(self, names=None):
+        """Read the given structs (default all) and return name -> field values."""
+        names = list(self.structs) if names is None else [n for n in names if n in self.structs]
+        if not names:
+            return {}
+
+        self._revalidate(names)
+        regions = [(self.address_cache[n].address, self.structs[n]["layout"].size) for n in names]
+        buffers = self.backend.read_many(regions)
+        return {name: self.structs[name]["layout"].unpack(data) for name, data in zip(names, buffers)}
+
+    def read_sections(self, sections):
+        """Read every struct that feeds one of the given game state sections."""
+        names = [name for name, d in self.structs.items() if d["section"] in sections]
+        values = {}
+        for name, fields in self.read_structs(names).items():
+            values.setdefault(self.structs[name]["section"], {}).update(fields)
+        return values
+
+    def close(self):
+        self.backend.close()
+
+def open_backend(pid):
+    """Open the memory backend for the current platform."""
+    if sys.platform.startswith('win32'):
+        return Win32Backend(pid)
+    if sys.platform.startswith('linux'):
+        return ProcMemBackend(pid)
+    raise MemoryReadError(f"Memory reading is not supported on {sys.platform}")
+
+def create_memory_reader(settings=MEMORY_SETTINGS, backend=None):
+    """
+    Build a MemoryReader from settings, attaching to the game process unless
+    a backend (e.g. a FakeProcessImage) is given. Returns None if disabled
+    or the game is not running.
+    """
+    if backend is None:
+        if not settings.get("enabled"):
+            return None
+        process = find_process(settings["process_name"])
+        if process is None:
+            logging.debug(f"Game process {settings['process_name']} not found")
+            return None
+        try:
+            backend = open_backend(process.pid)
+        except MemoryReadError as e:
+            logging.warning(f"Cannot attach to game process: {str(e)}")
+            return None
+        logging.info(f"Attached to {settings['process_name']} (PID {process.pid})")
+
+    reader = MemoryReader(
+        backend,
+        pointer_size=settings.get("pointer_size", 4),
+        revalidate_interval=settings.get("revalidate_interval", 1.0)
+    )
+    for name, definition in settings.get("structs", {}).items():
+        reader.add_struct(
+            name,
+            definition["base"],
+            definition.get("offsets", [0]),
+            definition["fields"],
+            section=definition.get("section")
+        )
+    return reader
@@ -5,6 +5,9 @@ from pathlib import Path
 from datetime import datetime
 import pandas as pd
 from collections import defaultdict
+from features import analyze_movement, analyze_tactics
+from rollups import RollupBucket, load_rollups, select_resolution
+from catalog import DEFAULT_CATALOG_PATH, SessionCatalog, iter_log_segments
 
 class GameplayLearner:
     def __init__(self):
@@ -13,8 +16,29 @@ class GameplayLearner:
         self.performance_metrics = {}
         logging.info("GameplayLearner initialized")
 
-    def load_gameplay_data(self, log_directory='game_logs'):
-        """Load and preprocess gameplay log files."""
+    def select_sessions(self, log_directory='game_logs', **filters):
+        """
+        Query the session catalog for matching session IDs.
+
+        Accepts the filters of SessionCatalog.find_sessions (min_round,
+        weapon, since, limit). Returns None if no catalog exists yet.
+        """
+        catalog_path = Path(log_directory) / Path(DEFAULT_CATALOG_PATH).name
+        if not catalog_path.exists():
+            logging.warning(f"No session catalog at {catalog_path}")
+            return None
+
+        catalog = SessionCatalog(str(catalog_path))
+        try:
+            sessions = catalog.find_sessions(**filters)
+        finally:
+            catalog.close()
+
+        logging.info(f"Catalog matched {len(sessions)} sessions for {filters}")
+        return [session['session_id'] for session in sessions]
+
+    def load_gameplay_data(self, log_directory='game_logs', session_ids=None):
+        """Load and preprocess gameplay log files, optionally only for the given sessions."""
         try:
             log_path = Path(log_directory)
             if not log_path.exists():
@@ -26,17 +50,20 @@ class GameplayLearner:
             file_count = 0
             total_entries = 0
 
-            for log_file in log_path.glob('game_logs_*.json'):
+            if session_ids is None:
+                log_files = log_path.glob('game_logs_*.json')
+            else:
+                log_files = [log_path / f'game_logs_{session_id}.json' for session_id in session_ids]
+
+            for log_file in log_files:
                 try:
-                    with open(log_file, 'r') as f:
-                        log_data = json.load(f)
-                        if isinstance(log_data, list):
-                            total_entries += len(log_data)
-                            all_data.extend(log_data)
-                        else:
-                            total_entries += 1
-                            all_data.append(log_data)
-                        file_count += 1
+                    for segment in iter_log_segments(log_file):
+                        total_entries += len(segment)
+                        all_data.extend(segment)
+                    file_count += 1
+                except FileNotFoundError:
+                    logging.error(f"Missing log file {log_file}")
+                    continue
                 except json.JSONDecodeError:
                     logging.error(f"Error decoding {log_file}")
                     continue
@@ -104,83 +131,74 @@ class GameplayLearner:
 
     def _analyze_movement(self, key_states):
         """Analyze movement patterns from key states."""
-        movement_type = 'stationary'
-
-        if not key_states:
-            return movement_type
-
-        # Convert key states to set for easier checking
-        keys = set(key_states)
-
-        # Movement pattern analysis
-        if 'w' in keys and 'shift' in keys:
-            movement_type = 'rushing'
-        elif 'w' in keys and 'ctrl' in keys:
-            movement_type = 'sneaking'
-        elif len(keys.intersection({'w', 'a', 's', 'd'})) > 1:
-            movement_type = 'strafing'
-        elif len(keys.intersection({'w', 'a', 's', 'd'})) == 1:
-            movement_type = 'direct_movement'
-
-        return movement_type
+        return analyze_movement(key_states)
 
     def _analyze_tactics(self, game_state):
         """Analyze tactical decisions from game state."""
-        tactical_profile = {
-            'aggression_level': 0,  # 0-1 scale
-            'positioning': 'unknown',
-            'objective_focus': 0  # 0-1 scale
-        }
+        return analyze_tactics(game_state)
 
+    def load_rollup_summary(self, log_directory='game_logs', granularity=None):
+        """
+        Merge the session rollups at the coarsest resolution that answers
+        the query. Returns None unless every log file has rollups.
+        """
         try:
-            # Analyze aggression level based on actions and state
-            player = game_state.get('player', {})
-            actions = game_state.get('actions', {})
-
-            # Calculate aggression based on multiple factors
-            aggression_factors = []
-
-            # Weapon usage
-            weapon = player.get('weapon', {})
-            if weapon.get('shots_fired', 0) > 0:
-                aggression_factors.append(0.7)
-                logging.debug("Aggressive behavior detected: Active weapon usage")
-
-            # Movement style
-            if actions.get('tactical', {}).get('sprinting', False):
-                aggression_factors.append(0.8)
-                logging.debug("Aggressive behavior detected: Sprinting")
-            elif actions.get('tactical', {}).get('crouching', False):
-                aggression_factors.append(0.3)
-                logging.debug("Defensive behavior detected: Crouching")
-
-            # Position relative to cover
-            if game_state.get('environment', {}).get('in_cover', False):
-                aggression_factors.append(0.2)
-                tactical_profile['positioning'] = 'defensive'
-                logging.debug("Defensive positioning: In cover")
-            else:
-                tactical_profile['positioning'] = 'aggressive'
-                logging.debug("Aggressive positioning: Out of cover")
+            log_path = Path(log_directory)
+            rollup_files = sorted(log_path.glob('rollups_*.jsonl'))
+            if not rollup_files:
+                return None
 
-            # Calculate average aggression
-            if aggression_factors:
-                tactical_profile['aggression_level'] = sum(aggression_factors) / len(aggression_factors)
+            # Sessions logged before rollups existed have to be read raw
+            rollup_sessions = {f.stem[len('rollups_'):] for f in rollup_files}
+            for log_file in log_path.glob('game_logs_*.json'):
+                if log_file.stem[len('game_logs_'):] not in rollup_sessions:
+                    logging.info(f"No rollups for {log_file}, falling back to raw data")
+                    return None
 
-            # Analyze objective focus
-            if game_state.get('game', {}).get('objectives_completed', 0) > 0:
-                tactical_profile['objective_focus'] = 0.7
-                logging.debug("High objective focus detected")
+            resolution = select_resolution(granularity)
+            buckets = load_rollups(rollup_files, resolution)
+            if not buckets:
+                return None
 
+            summary = RollupBucket()
+            for bucket in buckets.values():
+                summary.merge(bucket)
+
+            logging.info(f"Loaded {len(buckets)} '{resolution}' rollup buckets from {len(rollup_files)} files")
+            return summary
         except Exception as e:
-            logging.warning(f"Error in tactical analysis: {str(e)}")
+            logging.error(f"Error loading rollups: {str(e)}")
+            return None
 
-        return tactical_profile
+    def _analyze_rollups(self, summary):
+        """Build analysis results from a merged rollup bucket."""
+        return {
+            'movement_style': summary.mode('movement') or 'unknown',
+            'combat_effectiveness': {
+                'accuracy': float(summary.mean('accuracy')),
+                'total_shots': int(summary.total('shots_fired')),
+                'total_hits': int(summary.total('hits'))
+            },
+            'resource_efficiency': float(summary.mean('points_delta')),
+            'tactical_profile': {
+                'aggression_level': float(summary.mean('aggression')),
+                'preferred_positioning': summary.mode('positioning') or 'unknown'
+            }
+        }
 
     def analyze_gameplay(self):
         """Analyze gameplay data and generate insights."""
         try:
             logging.info("Starting gameplay analysis")
+
+            # Whole-history trends only need the coarsest rollups
+            summary = self.load_rollup_summary()
+            if summary is not None:
+                analysis_results = self._analyze_rollups(summary)
+                logging.info("Gameplay analysis completed from rollups")
+                logging.info(f"Analysis results: {json.dumps(analysis_results, indent=2)}")
+                return analysis_results
+
             gameplay_data = self.load_gameplay_data()
             if not gameplay_data:
                 logging.warning("No gameplay data available for analysis")
@@ -0,0 +1,106 @@
+import logging
+import math
+import time
+import numpy as np
+from config import PLAYSTYLE_SETTINGS
+from features import BEHAVIOR_LABELS, FEATURE_NAMES, extract_feature_vector
+from ring_buffer import RingBuffer
+
+def _default_weights():
+    """Hand-set weights used until a model has been trained, mirroring analyze_tactics."""
+    weights = np.zeros((len(FEATURE_NAMES), len(BEHAVIOR_LABELS)))
+    defensive, aggressive = BEHAVIOR_LABELS.index("defensive"), BEHAVIOR_LABELS.index("aggressive")
+    for name, toward_aggressive in (("sprinting", 2.0), ("shooting", 1.5), ("movement_keys", 0.5),
+                                    ("crouching", -1.5), ("in_cover", -2.0)):
+        column = FEATURE_NAMES.index(name)
+        weights[column, aggressive] = toward_aggressive
+        weights[column, defensive] = -toward_aggressive
+    return weights
+
+class StreamingPlaystyleClassifier:
+    """
+    Classifies playstyle live from a sliding window of recent ticks.
+
+    Feature vectors are kept in a NumPy ring with a running sum, so each
+    update costs one row write plus a small matrix-vector product on the
+    window mean, independent of the window length.
+    """
+
+    def __init__(self, weights, bias, scaler_mean=None, scaler_scale=None,
+                 window=PLAYSTYLE_SETTINGS["window"], min_confidence=PLAYSTYLE_SETTINGS["min_confidence"]):
+        n_features = len(FEATURE_NAMES)
+        weights = np.asarray(weights, dtype=float)
+        scaler_mean = np.zeros(n_features) if scaler_mean is None else np.asarray(scaler_mean, dtype=float)
+        scaler_scale = np.ones(n_features) if scaler_scale is None else np.asarray(scaler_scale, dtype=float)
+
+        # Fold standardization into the weights: ((x - mean) / scale) @ W + b == x @ W' + b'
+        self.weights = weights / scaler_scale[:, None]
+        self.bias = np.asarray(bias, dtype=float) - (scaler_mean / scaler_scale) @ weights
+        self.min_confidence = min_confidence
+        self.aggressive_index = BEHAVIOR_LABELS.index("aggressive")
+        self.defensive_index = BEHAVIOR_LABELS.index("defensive")
+
+        self.window = RingBuffer(window, n_features)
+
+        self.behavior = "neutral"
+        self.style_score = 0.0
+        self.updates = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.over_budget = 0
+        self.latency_budget = PLAYSTYLE_SETTINGS["latency_budget_ms"] / 1000
+
+    @classmethod
+    def from_model_store(cls, model_directory=PLAYSTYLE_SETTINGS["model_directory"]):
+        """Build a classifier from the latest trained behavior model, or default weights."""
+        from training import ModelStore, RunningScaler
+        loaded = ModelStore(model_directory).load("behavior_classifier")
+        if loaded is None:
+            logging.info("No trained behavior model found, using default playstyle weights")
+            return cls(_default_weights(), np.zeros(len(BEHAVIOR_LABELS)))
+
+        arrays, metadata = loaded
+        if metadata.get("feature_names") != list(FEATURE_NAMES):
+            logging.warning("Behavior model was trained on different features, using default playstyle weights")
+            return cls(_default_weights(), np.zeros(len(BEHAVIOR_LABELS)))
+
+        scaler = RunningScaler.from_state(arrays)
+        logging.info(f"Loaded behavior model version {metadata['version']} for live playstyle inference")
+        return cls(arrays["weights"], arrays["bias"], scaler.mean, scaler.scale)
+
+    def update(self, log_entry):
+        """Add a tick to the window and return the current (behavior, style_score)."""
+        start = time.perf_counter()
+
+        self.window.append(extract_feature_vector(log_entry))
+
+        # Linear model on the window mean; softmax over the few classes in plain Python
+        logits = (self.window.total @ self.weights / self.window.count + self.bias).tolist()
+        top = max(logits)
+        exp = [math.exp(logit - top) for logit in logits]
+        total = sum(exp)
+        probabilities = [value / total for value in exp]
+
+        # Only switch behavior on a confident prediction
+        best = probabilities.index(max(probabilities))
+        if probabilities[best] >= self.min_confidence:
+            self.behavior = BEHAVIOR_LABELS[best]
+        self.style_score = probabilities[self.aggressive_index] - probabilities[self.defensive_index]
+
+        latency = time.perf_counter() - start
+        self.updates += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        if latency > self.latency_budget:
+            self.over_budget += 1
+        return self.behavior, self.style_score
+
+    def summary(self):
+        """Return latency statistics for session metadata."""
+        return {
+            "updates": self.updates,
+            "avg_latency_ms": round(self.total_latency / self.updates * 1000, 4) if self.updates else None,
+            "max_latency_ms": round(self.max_latency * 1000, 4),
+            "over_budget": self.over_budget,
+            "latency_budget_ms": round(self.latency_budget * 1000, 4)
+        }
@@ -0,0 +1,156 @@
+import logging
+import time
+from threading import Event, Thread
+from config import PERFORMANCE_SETTINGS, MEMORY_SETTINGS
+from utils import find_process, get_process
+
+METRICS_COLUMNS = (
+    "timestamp",
+    "host_cpu",
+    "host_memory",
+    "disk_write_mbps",
+    "logger_cpu",
+    "logger_rss_mb",
+    "game_cpu",
+    "game_rss_mb"
+)
+
+class ResourceMonitor:
+    """
+    Low-frequency background sampler for host, logger and game process usage.
+
+    Samples are appended to a CSV time series next to the session logs so
+    logger overhead can be correlated with game slowdowns.
+    """
+
+    def __init__(self, filename, settings=PERFORMANCE_SETTINGS, game_process_name=MEMORY_SETTINGS["process_name"]):
+        self.filename = filename
+        self.settings = settings
+        self.game_process_name = game_process_name
+        self.sample_interval = settings.get("sample_interval", 1.0)
+        self.stop_event = Event()
+        self.thread = None
+        self.psutil = None
+        self.logger_process = None
+        self.game_process = None
+        self.last_game_search = 0
+        self.last_disk_write = None
+        self.last_sample_time = None
+        self.cpu_warning_active = False
+        self.memory_warning_active = False
+
+    def start(self):
+        """Start sampling on a daemon thread."""
+        if not (self.settings.get("monitor_cpu") or self.settings.get("monitor_memory")):
+            logging.info("Resource monitoring disabled in PERFORMANCE_SETTINGS")
+            return
+        self.stop_event.clear()
+        self.thread = Thread(target=self._run, name="ResourceMonitor", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop sampling and wait for the thread to finish."""
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=self.sample_interval * 2)
+            self.thread = None
+
+    def _load_psutil(self):
+        """Import psutil and get the logger process handle on first use."""
+        if self.psutil is None:
+            import psutil
+            self.psutil = psutil
+            self.logger_process = get_process()
+
+            # cpu_percent reports usage since the previous call, so prime it
+            psutil.cpu_percent(interval=None)
+            self.logger_process.cpu_percent(interval=None)
+
+    def _run(self):
+        try:
+            self._load_psutil()
+
+            with open(self.filename, 'a', buffering=1) as f:
+                if f.tell() == 0:
+                    f.write(",".join(METRICS_COLUMNS) + "\n")
+                while not self.stop_event.wait(self.sample_interval):
+                    sample = self.sample()
+                    f.write(",".join("" if sample[c] is None else str(sample[c]) for c in METRICS_COLUMNS) + "\n")
+                    self._check_thresholds(sample)
+            logging.info(f"Resource metrics saved to {self.filename}")
+        except Exception as e:
+            logging.error(f"Error in resource monitor: {str(e)}", exc_info=True)
+
+    def _find_game_process(self, now):
+        """Return a reused handle for the game process, searching at most every 10s."""
+        if self.game_process is not None:
+            if self.game_process.is_running():
+                return self.game_process
+            self.game_process = None
+
+        if now - self.last_game_search < 10:
+            return None
+        self.last_game_search = now
+
+        process = find_process(self.game_process_name)
+        if process is not None:
+            process.cpu_percent(interval=None)
+            self.game_process = process
+            logging.info(f"Monitoring game process {self.game_process_name} (PID {process.pid})")
+        return self.game_process
+
+    def sample(self):
+        """Take one sample of all metrics."""
+        # CPU usage right after priming covers almost no time, so it is left empty
+        cpu_primed = self.psutil is not None
+        self._load_psutil()
+        psutil = self.psutil
+        now = time.time()
+        monitor_cpu = self.settings.get("monitor_cpu")
+        monitor_memory = self.settings.get("monitor_memory")
+        sample = dict.fromkeys(METRICS_COLUMNS)
+        sample["timestamp"] = round(now, 3)
+
+        if monitor_cpu and cpu_primed:
+            sample["host_cpu"] = psutil.cpu_percent(interval=None)
+            sample["logger_cpu"] = self.logger_process.cpu_percent(interval=None)
+        if monitor_memory:
+            sample["host_memory"] = psutil.virtual_memory().percent
+            sample["logger_rss_mb"] = round(self.logger_process.memory_info().rss / 1024 / 1024, 1)
+
+        disk = psutil.disk_io_counters()
+        if disk is not None:
+            if self.last_disk_write is not None and now > self.last_sample_time:
+                written = disk.write_bytes - self.last_disk_write
+                sample["disk_write_mbps"] = round(written / 1024 / 1024 / (now - self.last_sample_time), 3)
+            self.last_disk_write = disk.write_bytes
+            self.last_sample_time = now
+
+        game_process = self._find_game_process(now)
+        if game_process is not None:
+            try:
+                with game_process.oneshot():
+                    if monitor_cpu:
+                        sample["game_cpu"] = game_process.cpu_percent(interval=None)
+                    if monitor_memory:
+                        sample["game_rss_mb"] = round(game_process.memory_info().rss / 1024 / 1024, 1)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                self.game_process = None
+
+        return sample
+
+    def _check_thresholds(self, sample):
+        """Warn once each time host usage crosses a PERFORMANCE_SETTINGS threshold."""
+        cpu = sample["host_cpu"]
+        if cpu is not None:
+            over = cpu > self.settings["warning_threshold_cpu"]
+            if over and not self.cpu_warning_active:
+                logging.warning(f"Host CPU usage {cpu:.0f}% above {self.settings['warning_threshold_cpu']}% threshold")
+            self.cpu_warning_active = over
+
+        memory = sample["host_memory"]
+        if memory is not None:
+            over = memory > self.settings["warning_threshold_memory"]
+            if over and not self.memory_warning_active:
+                logging.warning(f"Host memory usage {memory:.0f}% above {self.settings['warning_threshold_memory']}% threshold")
+            self.memory_warning_active = over
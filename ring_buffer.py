@@ -0,0 +1,41 @@
+import numpy as np
+
+class RingBuffer:
+    """
+    Fixed-size NumPy ring of values (or rows of `width` values) with a
+    running sum, so window sums and means cost O(1) per append.
+    """
+
+    def __init__(self, capacity, width=None):
+        self.capacity = capacity
+        self.values = np.zeros(capacity if width is None else (capacity, width))
+        self.total = 0.0 if width is None else np.zeros(width)
+        self.index = 0
+        self.count = 0
+
+    @property
+    def full(self):
+        return self.count == self.capacity
+
+    def append(self, value):
+        """Store a value over the oldest one and return the slot it was written to."""
+        slot = self.index
+        self.total -= self.values[slot]
+        self.values[slot] = value
+        self.total += self.values[slot]
+        if self.count < self.capacity:
+            self.count += 1
+
+        self.index += 1
+        if self.index == self.capacity:
+            self.index = 0
+            # Re-sum once per wrap so floating point drift does not accumulate
+            self.total = self.values.sum(axis=0)
+        return slot
+
+    def recent(self, n):
+        """Return the most recent n values (at most the stored ones), oldest first."""
+        n = min(n, self.count)
+        if n <= self.index:
+            return self.values[self.index - n:self.index]
+        return np.concatenate((self.values[self.capacity - (n - self.index):], self.values[:self.index]))
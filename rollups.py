@@ -0,0 +1,268 @@
+import json
+import logging
+import os
+from pathlib import Path
+from features import analyze_movement, analyze_tactics
+
+# Rollup resolutions ordered from finest to coarsest. The value is the bucket
+# width in seconds; per-round buckets have no fixed width.
+RESOLUTIONS = {
+    "1s": 1,
+    "1min": 60,
+    "round": None
+}
+
+# Numeric metrics tracked with count/sum/min/max
+ROLLUP_METRICS = ("accuracy", "shots_fired", "hits", "points_delta", "aggression")
+
+# Categorical metrics tracked with mode sketches
+ROLLUP_MODES = ("movement", "positioning")
+
+def select_resolution(granularity=None, available=None):
+    """
+    Pick the coarsest resolution that still answers a query.
+
+    granularity is the finest time step (in seconds) the query needs, or None
+    when only whole-history aggregates are required.
+    """
+    candidates = [name for name in RESOLUTIONS if available is None or name in available]
+    if not candidates:
+        return None
+
+    if granularity is None:
+        return candidates[-1]
+
+    best = None
+    for name in candidates:
+        width = RESOLUTIONS[name]
+        if width is not None and width <= granularity:
+            best = name
+    return best
+
+def extract_rollup_sample(entry, last_points=None):
+    """Extract the per-sample values that feed the rollups from a log entry."""
+    sample = {}
+    game_state = entry.get('game_state', {})
+
+    if 'input_data' in entry:
+        sample['movement'] = analyze_movement(entry['input_data'].get('keyboard', []))
+
+    if 'player' in game_state:
+        player = game_state['player']
+        weapon = player.get('weapon', {})
+        sample['accuracy'] = weapon.get('accuracy', 0)
+        sample['shots_fired'] = weapon.get('shots_fired', 0)
+        sample['hits'] = weapon.get('hits', 0)
+        points = player.get('points', 0)
+        sample['points'] = points
+        if last_points is not None:
+            sample['points_delta'] = points - last_points
+
+    if game_state:
+        tactics = analyze_tactics(game_state)
+        sample['aggression'] = tactics['aggression_level']
+        sample['positioning'] = tactics['positioning']
+
+    return sample
+
+class ModeSketch:
+    """Bounded frequency sketch (Misra-Gries) for finding the most common value."""
+
+    def __init__(self, capacity=8, counts=None):
+        self.capacity = capacity
+        self.counts = dict(counts or {})
+
+    def add(self, value, count=1):
+        """Count an occurrence of value."""
+        if value in self.counts or len(self.counts) < self.capacity:
+            self.counts[value] = self.counts.get(value, 0) + count
+            return
+
+        # Sketch is full: decrement every counter and drop the ones that hit zero
+        decrement = min(count, min(self.counts.values()))
+        self.counts = {k: v - decrement for k, v in self.counts.items() if v > decrement}
+        if count > decrement:
+            self.add(value, count - decrement)
+
+    def merge(self, other):
+        """Fold another sketch into this one."""
+        for value, count in other.counts.items():
+            self.add(value, count)
+
+    def mode(self):
+        """Return the most common value seen, or None if empty."""
+        if not self.counts:
+            return None
+        return max(self.counts.items(), key=lambda item: item[1])[0]
+
+class RollupBucket:
+    """Count, sum, min, max and mode sketches for one rollup interval."""
+
+    def __init__(self):
+        self.metrics = {}
+        self.modes = {}
+
+    def add_sample(self, sample):
+        """Fold a single extracted sample into the bucket."""
+        for name in ROLLUP_METRICS:
+            if name in sample:
+                self._add_metric(name, 1, sample[name], sample[name], sample[name])
+        for name in ROLLUP_MODES:
+            if name in sample:
+                self.modes.setdefault(name, ModeSketch()).add(sample[name])
+
+    def _add_metric(self, name, count, total, low, high):
+        stats = self.metrics.get(name)
+        if stats is None:
+            self.metrics[name] = {"count": count, "sum": total, "min": low, "max": high}
+            return
+        stats["count"] += count
+        stats["sum"] += total
+        stats["min"] = min(stats["min"], low)
+        stats["max"] = max(stats["max"], high)
+
+    def merge(self, other):
+        """Fold another bucket into this one."""
+        for name, stats in other.metrics.items():
+            self._add_metric(name, stats["count"], stats["sum"], stats["min"], stats["max"])
+        for name, sketch in other.modes.items():
+            self.modes.setdefault(name, ModeSketch()).merge(sketch)
+
+    def count(self, name):
+        return self.metrics.get(name, {}).get("count", 0)
+
+    def total(self, name):
+        return self.metrics.get(name, {}).get("sum", 0)
+
+    def mean(self, name):
+        count = self.count(name)
+        return self.total(name) / count if count else 0
+
+    def mode(self, name):
+        sketch = self.modes.get(name)
+        return sketch.mode() if sketch else None
+
+    def to_dict(self):
+        return {
+            "metrics": self.metrics,
+            "modes": {name: sketch.counts for name, sketch in self.modes.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        bucket = cls()
+        bucket.metrics = {name: dict(stats) for name, stats in data.get("metrics", {}).items()}
+        bucket.modes = {name: ModeSketch(counts=counts) for name, counts in data.get("modes", {}).items()}
+        return bucket
+
+class RollupStore:
+    """
+    Incrementally maintained multi-resolution rollups for a logging session.
+
+    Entries are folded in as they are captured. Buckets that can no longer
+    change are flushed append-only to a JSON lines file, so each flush only
+    writes what closed since the previous one.
+    """
+
+    def __init__(self):
+        self.open_buckets = {name: {} for name in RESOLUTIONS}
+        self.closed_buckets = []
+        self.last_points = None
+
+    def _bucket_key(self, resolution, entry):
+        width = RESOLUTIONS[resolution]
+        if width is None:
+            return entry.get('game_state', {}).get('game', {}).get('round', 0)
+        return int(entry.get('timestamp', 0) // width) * width
+
+    def add_entry(self, entry):
+        """Fold a single log entry into every resolution."""
+        sample = extract_rollup_sample(entry, self.last_points)
+        if 'points' in sample:
+            self.last_points = sample['points']
+
+        for resolution, buckets in self.open_buckets.items():
+            key = self._bucket_key(resolution, entry)
+            if key not in buckets:
+                # Data moved on to a new interval, so the old ones are final
+                for old_key in list(buckets):
+                    self.closed_buckets.append((resolution, old_key, buckets.pop(old_key)))
+                buckets[key] = RollupBucket()
+            buckets[key].add_sample(sample)
+
+    def add_entries(self, entries):
+        for entry in entries:
+            self.add_entry(entry)
+
+    def flush(self, filename, final=False):
+        """
+        Append closed buckets to filename.
+
+        Open buckets are snapshotted to a small sidecar file so readers see
+        the in-progress interval; on the final flush they are appended too.
+        """
+        pending = self.closed_buckets
+        self.closed_buckets = []
+        if final:
+            for resolution, buckets in self.open_buckets.items():
+                pending.extend((resolution, key, bucket) for key, bucket in buckets.items())
+                buckets.clear()
+
+        open_filename = open_rollups_path(filename)
+        try:
+            if pending:
+                with open(filename, 'a') as f:
+                    for resolution, key, bucket in pending:
+                        f.write(json.dumps(_bucket_record(resolution, key, bucket)) + "\n")
+
+            if final:
+                if os.path.exists(open_filename):
+                    os.remove(open_filename)
+            else:
+                with open(open_filename, 'w') as f:
+                    json.dump([
+                        _bucket_record(resolution, key, bucket)
+                        for resolution, buckets in self.open_buckets.items()
+                        for key, bucket in buckets.items()
+                    ], f)
+        except Exception as e:
+            logging.error(f"Error saving rollups to {filename}: {str(e)}", exc_info=True)
+
+def _bucket_record(resolution, key, bucket):
+    record = {"resolution": resolution, "key": key}
+    record.update(bucket.to_dict())
+    return record
+
+def open_rollups_path(filename):
+    """Return the sidecar file holding a session's still-open buckets."""
+    return str(Path(filename).with_suffix('.open.json'))
+
+def load_rollups(filenames, resolution):
+    """Load and merge the buckets of one resolution from rollup files."""
+    buckets = {}
+
+    def add_record(record):
+        if record.get("resolution") != resolution:
+            return
+        bucket = RollupBucket.from_dict(record)
+        if record["key"] in buckets:
+            buckets[record["key"]].merge(bucket)
+        else:
+            buckets[record["key"]] = bucket
+
+    for filename in filenames:
+        try:
+            with open(filename, 'r') as f:
+                for line in f:
+                    if line.strip():
+                        add_record(json.loads(line))
+
+            open_filename = open_rollups_path(filename)
+            if os.path.exists(open_filename):
+                with open(open_filename, 'r') as f:
+                    for record in json.load(f):
+                        add_record(record)
+        except (OSError, json.JSONDecodeError) as e:
+            logging.error(f"Error reading rollups from {filename}: {str(e)}")
+            continue
+    return buckets
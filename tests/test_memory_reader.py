@@ -0,0 +1,106 @@
+import struct
+import pytest
+from data_collector import DataCollector
+from memory_reader import FakeProcessImage, MemoryReadError, create_memory_reader
+
+BASE = 0x400000
+PLAYER_POINTER = BASE + 0x10
+PLAYER = BASE + 0x200
+MOVED_PLAYER = BASE + 0x600
+
+SETTINGS = {
+    "pointer_size": 4,
+    "revalidate_interval": 3600,
+    "structs": {
+        "player": {
+            "section": "player",
+            "base": BASE,
+            "offsets": [0x10, 0x0],
+            "fields": {
+                "health": [0x0, "i"],
+                "position.x": [0x4, "f"],
+                "weapon.ammo.current": [0x8, "i"]
+            }
+        },
+        "tactical": {
+            "section": "actions",
+            "base": BASE + 0x300,
+            "offsets": [0x0],
+            "fields": {"tactical.sprinting": [0x0, "?"]}
+        }
+    }
+}
+
+def write_player(image, address, health, x, ammo):
+    image.write(address, struct.pack('<ifi', health, x, ammo))
+
+@pytest.fixture
+def image(tmp_path):
+    image = FakeProcessImage(str(tmp_path / "game.bin"), BASE, 0x1000)
+    image.write(PLAYER_POINTER, struct.pack('<I', PLAYER))
+    write_player(image, PLAYER, health=75, x=12.5, ammo=8)
+    yield image
+    image.close()
+
+def make_reader(image, **overrides):
+    return create_memory_reader(dict(SETTINGS, **overrides), backend=image)
+
+def test_resolves_pointer_chain_and_caches_address(image):
+    reader = make_reader(image)
+
+    values = reader.read_structs(["player"])
+    assert values["player"] == {"health": 75, "position.x": 12.5, "weapon.ammo.current": 8}
+    assert reader.address_cache["player"].address == PLAYER
+
+    # The cached address is reused: later ticks only read the struct itself
+    calls = image.read_calls
+    write_player(image, PLAYER, health=60, x=12.5, ammo=7)
+    assert reader.read_structs(["player"])["player"]["health"] == 60
+    assert image.read_calls == calls + 1
+
+def test_revalidation_follows_moved_struct(image):
+    reader = make_reader(image, revalidate_interval=0)
+    reader.read_structs(["player"])
+
+    # The game reallocates the struct and updates the last pointer
+    write_player(image, MOVED_PLAYER, health=40, x=-3.0, ammo=30)
+    image.write(PLAYER_POINTER, struct.pack('<I', MOVED_PLAYER))
+
+    values = reader.read_structs(["player"])
+    assert values["player"]["health"] == 40
+    assert reader.address_cache["player"].address == MOVED_PLAYER
+
+def test_null_pointer_falls_back_to_mock_values(image):
+    image.write(PLAYER_POINTER, struct.pack('<I', 0))
+    reader = make_reader(image)
+
+    with pytest.raises(MemoryReadError):
+        reader.resolve("player")
+
+    collector = DataCollector(memory_reader=reader)
+    player = collector.get_game_state()["player"]
+    assert player["health"] == 100
+    assert player["weapon"]["ammo"]["current"] == 30
+    assert collector.memory_values == {}
+
+def test_one_batched_read_per_tick(image):
+    collector = DataCollector(memory_reader=make_reader(image))
+    collector.get_game_state()
+
+    for _ in range(5):
+        calls = image.read_calls
+        collector.get_game_state()
+        assert image.read_calls == calls + 1
+
+def test_memory_values_overlay_dotted_paths(image):
+    image.write(BASE + 0x300, b"\x01")
+    collector = DataCollector(memory_reader=make_reader(image))
+
+    game_state = collector.get_game_state()
+    player = game_state["player"]
+    assert player["health"] == 75
+    assert player["position"] == {"x": 12.5, "y": 0.0, "z": 0.0}
+    assert player["weapon"]["ammo"] == {"current": 8, "reserve": 120}
+    assert player["weapon"]["name"] == "MP40"
+    assert game_state["actions"]["tactical"]["sprinting"] is True
+    assert game_state["actions"]["tactical"]["crouching"] is False
@@ -0,0 +1,110 @@
+import logging
+import time
+from collections import deque
+
+class DegradationStep:
+    """A piece of optional work that can be shed when the tick budget is exceeded."""
+
+    def __init__(self, name, shed, restore):
+        self.name = name
+        self.shed = shed
+        self.restore = restore
+
+class TickBudget:
+    """
+    Tracks per-stage costs against the tick budget and sheds optional work.
+
+    Steps are shed one at a time, in priority order, when most ticks in the
+    last window went over budget, and restored in reverse order once a full
+    window had headroom. Single slow ticks (saves, analysis) do not trigger
+    a change on their own.
+    """
+
+    def __init__(self, frequency, steps=None, overload_ratio=0.9, recovery_ratio=0.5, smoothing=0.05):
+        self.budget = 1.0 / frequency
+        self.steps = list(steps or [])
+        self.overload_ratio = overload_ratio
+        self.recovery_ratio = recovery_ratio
+        self.smoothing = smoothing
+        self.level = 0
+        self.stage_costs = {}
+        self.tick_cost = 0.0
+        self.events = []
+
+        # One second worth of ticks
+        self.window = deque(maxlen=max(1, int(frequency)))
+        self.over_count = 0
+        self.headroom_count = 0
+
+    def add_step(self, name, shed, restore):
+        self.steps.append(DegradationStep(name, shed, restore))
+
+    def end_tick(self, stage_costs):
+        """Record the cost in seconds of each stage of a finished tick."""
+        total = 0.0
+        for stage, cost in stage_costs.items():
+            previous = self.stage_costs.get(stage, cost)
+            self.stage_costs[stage] = previous + self.smoothing * (cost - previous)
+            total += cost
+        self.tick_cost += self.smoothing * (total - self.tick_cost)
+
+        over = total > self.budget * self.overload_ratio
+        headroom = total < self.budget * self.recovery_ratio
+        if len(self.window) == self.window.maxlen:
+            old_over, old_headroom = self.window[0]
+            self.over_count -= old_over
+            self.headroom_count -= old_headroom
+        self.window.append((over, headroom))
+        self.over_count += over
+        self.headroom_count += headroom
+
+        if self.over_count * 2 >= self.window.maxlen and self.level < len(self.steps):
+            self._change_level(1)
+        elif self.headroom_count == self.window.maxlen and self.level > 0:
+            self._change_level(-1)
+
+    def _change_level(self, direction):
+        if direction > 0:
+            step = self.steps[self.level]
+            step.shed()
+            self.level += 1
+            action = "degrade"
+        else:
+            self.level -= 1
+            step = self.steps[self.level]
+            step.restore()
+            action = "restore"
+
+        event = {
+            "timestamp": time.time(),
+            "action": action,
+            "step": step.name,
+            "level": self.level,
+            "tick_cost_ms": round(self.tick_cost * 1000, 3),
+            "budget_ms": round(self.budget * 1000, 3),
+            "stage_costs_ms": {stage: round(cost * 1000, 3) for stage, cost in self.stage_costs.items()}
+        }
+        self.events.append(event)
+
+        if direction > 0:
+            logging.warning(
+                f"Tick budget exceeded ({event['tick_cost_ms']:.2f}ms of {event['budget_ms']:.2f}ms), "
+                f"shedding '{step.name}' (level {self.level})"
+            )
+        else:
+            logging.info(f"Tick budget has headroom again, restoring '{step.name}' (level {self.level})")
+
+        # Start a fresh window so the next decision reflects the new level
+        self.window.clear()
+        self.over_count = 0
+        self.headroom_count = 0
+
+    def summary(self):
+        """Return the current costs and degradation history for session metadata."""
+        return {
+            "budget_ms": round(self.budget * 1000, 3),
+            "level": self.level,
+            "tick_cost_ms": round(self.tick_cost * 1000, 3),
+            "stage_costs_ms": {stage: round(cost * 1000, 3) for stage, cost in self.stage_costs.items()},
+            "degradation_events": self.events
+        }
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import logging
+import time
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+from catalog import iter_log_segments
+from features import BEHAVIOR_LABELS, FEATURE_NAMES, extract_behavior_label, extract_feature_vector
+from labels import SessionLabels
+
+def iter_feature_chunks(log_directory='game_logs', chunk_size=4096, session_ids=None):
+    """
+    Stream (features, labels) chunks from the gameplay logs.
+
+    Log files are read one segment at a time, so memory use is bounded by
+    the chunk size and the largest segment rather than the size of the logs.
+    Labels come from the session's labels file (see labels.py), falling back
+    to behavior reported while logging, and are -1 where neither exists.
+    """
+    log_path = Path(log_directory)
+    if session_ids is None:
+        log_files = sorted(log_path.glob('game_logs_*.json'))
+    else:
+        log_files = [log_path / f'game_logs_{session_id}.json' for session_id in session_ids]
+
+    features = np.empty((chunk_size, len(FEATURE_NAMES)))
+    labels = np.empty(chunk_size, dtype=np.int64)
+    filled = 0
+
+    for log_file in log_files:
+        try:
+            session_labels = SessionLabels.load(log_directory, log_file.stem[len('game_logs_'):])
+            for segment in iter_log_segments(log_file):
+                for entry in segment:
+                    features[filled] = extract_feature_vector(entry)
+                    label = session_labels.label_at(entry.get('timestamp', 0))
+                    if label is None:
+                        label = extract_behavior_label(entry)
+                    labels[filled] = -1 if label is None else label
+                    filled += 1
+                    if filled == chunk_size:
+                        yield features.copy(), labels.copy()
+                        filled = 0
+        except (OSError, json.JSONDecodeError) as e:
+            logging.error(f"Error reading {log_file}: {str(e)}")
+            continue
+
+    if filled:
+        yield features[:filled].copy(), labels[:filled].copy()
+
+class RunningScaler:
+    """Feature standardization with mean and variance merged across chunks."""
+
+    def __init__(self, n_features):
+        self.count = 0
+        self.mean = np.zeros(n_features)
+        self.m2 = np.zeros(n_features)
+
+    def partial_fit(self, X):
+        # Chan et al. parallel variance update
+        n = len(X)
+        if n == 0:
+            return
+        batch_mean = X.mean(axis=0)
+        batch_m2 = ((X - batch_mean) ** 2).sum(axis=0)
+        total = self.count + n
+        delta = batch_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += batch_m2 + delta ** 2 * self.count * n / total
+        self.count = total
+
+    @property
+    def scale(self):
+        std = np.sqrt(self.m2 / self.count) if self.count else np.ones_like(self.m2)
+        return np.where(std > 1e-12, std, 1.0)
+
+    def transform(self, X):
+        return (X - self.mean) / self.scale
+
+    def state(self):
+        return {"scaler_count": np.array(self.count), "scaler_mean": self.mean, "scaler_m2": self.m2}
+
+    @classmethod
+    def from_state(cls, state):
+        scaler = cls(len(state["scaler_mean"]))
+        scaler.count = int(state["scaler_count"])
+        scaler.mean = np.array(state["scaler_mean"], dtype=float)
+        scaler.m2 = np.array(state["scaler_m2"], dtype=float)
+        return scaler
+
+class OnlineLogisticRegression:
+    """Multinomial logistic regression trained with mini-batch SGD."""
+
+    def __init__(self, n_features, n_classes=len(BEHAVIOR_LABELS), learning_rate=0.05, l2=1e-4):
+        self.weights = np.zeros((n_features, n_classes))
+        self.bias = np.zeros(n_classes)
+        self.learning_rate = learning_rate
+        self.l2 = l2
+        self.samples_seen = 0
+
+    def predict_proba(self, X):
+        logits = X @ self.weights + self.bias
+        logits -= logits.max(axis=1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def predict(self, X):
+        return self.predict_proba(X).argmax(axis=1)
+
+    def partial_fit(self, X, y, batch_size=256):
+        """Run one SGD pass over a chunk of standardized features."""
+        losses = []
+        for start in range(0, len(X), batch_size):
+            X_batch = X[start:start + batch_size]
+            y_batch = y[start:start + batch_size]
+            probabilities = self.predict_proba(X_batch)
+            losses.append(-np.log(probabilities[np.arange(len(y_batch)), y_batch] + 1e-12).mean())
+
+            gradient = probabilities
+            gradient[np.arange(len(y_batch)), y_batch] -= 1
+            gradient /= len(y_batch)
+            self.weights -= self.learning_rate * (X_batch.T @ gradient + self.l2 * self.weights)
+            self.bias -= self.learning_rate * gradient.sum(axis=0)
+        self.samples_seen += len(X)
+        return float(np.mean(losses)) if losses else 0.0
+
+    def state(self):
+        return {"weights": self.weights, "bias": self.bias, "samples_seen": np.array(self.samples_seen)}
+
+    @classmethod
+    def from_state(cls, state):
+        model = cls(*state["weights"].shape)
+        model.weights = np.array(state["weights"], dtype=float)
+        model.bias = np.array(state["bias"], dtype=float)
+        model.samples_seen = int(state["samples_seen"])
+        return model
+
+class MiniBatchKMeans:
+    """Mini-batch k-means with per-center learning rates for playstyle clustering."""
+
+    def __init__(self, n_clusters=3, seed=0):
+        self.n_clusters = n_clusters
+        self.centers = None
+        self.counts = np.zeros(n_clusters)
+        self.rng = np.random.default_rng(seed)
+        self.samples_seen = 0
+
+    def predict(self, X):
+        distances = ((X[:, None, :] - self.centers[None, :, :]) ** 2).sum(axis=2)
+        return distances.argmin(axis=1)
+
+    def partial_fit(self, X):
+        """Update the centers from a chunk of standardized features."""
+        if len(X) == 0:
+            return
+        if self.centers is None:
+            if len(X) < self.n_clusters:
+                return
+            self.centers = X[self.rng.choice(len(X), self.n_clusters, replace=False)].copy()
+
+        assignments = self.predict(X)
+        for cluster in range(self.n_clusters):
+            members = X[assignments == cluster]
+            if len(members) == 0:
+                continue
+            self.counts[cluster] += len(members)
+            rate = len(members) / self.counts[cluster]
+            self.centers[cluster] += rate * (members.mean(axis=0) - self.centers[cluster])
+        self.samples_seen += len(X)
+
+    def state(self):
+        return {"centers": self.centers, "counts": self.counts, "samples_seen": np.array(self.samples_seen)}
+
+    @classmethod
+    def from_state(cls, state):
+        model = cls(len(state["centers"]))
+        model.centers = np.array(state["centers"], dtype=float)
+        model.counts = np.array(state["counts"], dtype=float)
+        model.samples_seen = int(state["samples_seen"])
+        return model
+
+class ModelStore:
+    """Versioned model persistence: <directory>/<name>/v<version>.npz plus a JSON sidecar."""
+
+    def __init__(self, directory='models'):
+        self.directory = Path(directory)
+
+    def versions(self, name):
+        model_dir = self.directory / name
+        if not model_dir.exists():
+            return []
+        return sorted(int(path.stem[1:]) for path in model_dir.glob('v*.npz'))
+
+    def save(self, name, arrays, metadata):
+        """Save arrays as the next version of a model and return the version number."""
+        model_dir = self.directory / name
+        model_dir.mkdir(parents=True, exist_ok=True)
+        versions = self.versions(name)
+        version = versions[-1] + 1 if versions else 1
+
+        np.savez(model_dir / f"v{version:04d}.npz", **arrays)
+        with open(model_dir / f"v{version:04d}.json", 'w') as f:
+            json.dump(dict(metadata, version=version, created=datetime.now().isoformat()), f, indent=2)
+        logging.info(f"Saved model {name} version {version} to {model_dir}")
+        return version
+
+    def load(self, name, version=None):
+        """Load a model version (default latest) as (arrays, metadata), or None."""
+        versions = self.versions(name)
+        if not versions:
+            return None
+        version = versions[-1] if version is None else version
+        model_dir = self.directory / name
+        with np.load(model_dir / f"v{version:04d}.npz") as data:
+            arrays = {key: data[key] for key in data.files}
+        with open(model_dir / f"v{version:04d}.json", 'r') as f:
+            metadata = json.load(f)
+        return arrays, metadata
+
+def train_playstyle_models(log_directory='game_logs', model_directory='models', chunk_size=4096,
+                           epochs=1, n_clusters=3, session_ids=None):
+    """
+    Train the behavior classifier and playstyle clusters out of core.
+
+    The first pass fits the feature scaler, then each epoch streams the logs
+    again to fit both models. Returns training statistics including
+    throughput in samples per second.
+    """
+    n_features = len(FEATURE_NAMES)
+    scaler = RunningScaler(n_features)
+    classifier = OnlineLogisticRegression(n_features)
+    clusters = MiniBatchKMeans(n_clusters)
+
+    labeled = 0
+    start = time.perf_counter()
+    for X, y in iter_feature_chunks(log_directory, chunk_size, session_ids):
+        scaler.partial_fit(X)
+        labeled += int((y >= 0).sum())
+    scaler_time = time.perf_counter() - start
+    if scaler.count == 0:
+        logging.warning("No gameplay data available for training")
+        return None
+    logging.info(f"Fitted feature scaler on {scaler.count} samples "
+                 f"({scaler.count / scaler_time:.0f} samples/s)")
+
+    loss = None
+    train_start = time.perf_counter()
+    for epoch in range(epochs):
+        epoch_start = time.perf_counter()
+        epoch_samples = 0
+        losses = []
+        for X, y in iter_feature_chunks(log_directory, chunk_size, session_ids):
+            X = scaler.transform(X)
+            clusters.partial_fit(X)
+            mask = y >= 0
+            if mask.any():
+                losses.append(classifier.partial_fit(X[mask], y[mask]))
+            epoch_samples += len(X)
+        epoch_time = time.perf_counter() - epoch_start
+        loss = float(np.mean(losses)) if losses else None
+        logging.info(f"Epoch {epoch + 1}/{epochs}: {epoch_samples} samples, "
+                     f"{epoch_samples / epoch_time:.0f} samples/s, loss {loss}")
+    train_time = time.perf_counter() - train_start
+
+    samples = scaler.count * epochs
+    stats = {
+        "samples": scaler.count,
+        "labeled_samples": labeled,
+        "epochs": epochs,
+        "final_loss": loss,
+        "throughput_samples_per_s": round(samples / train_time, 1) if train_time > 0 else None
+    }
+
+    store = ModelStore(model_directory)
+    metadata = {"feature_names": list(FEATURE_NAMES), "labels": list(BEHAVIOR_LABELS), "training": stats}
+    if labeled:
+        stats["classifier_version"] = store.save(
+            "behavior_classifier", {**scaler.state(), **classifier.state()}, metadata
+        )
+    else:
+        logging.warning("No behavior labels in the logs (label sessions with labels.py), "
+                        "behavior classifier not saved")
+    if clusters.centers is not None:
+        stats["clusters_version"] = store.save(
+            "playstyle_clusters", {**scaler.state(), **clusters.state()}, metadata
+        )
+
+    logging.info(f"Training completed: {json.dumps(stats)}")
+    return stats
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Train playstyle models from gameplay logs")
+    parser.add_argument("--log-directory", default="game_logs")
+    parser.add_argument("--model-directory", default="models")
+    parser.add_argument("--chunk-size", type=int, default=4096)
+    parser.add_argument("--epochs", type=int, default=1)
+    parser.add_argument("--clusters", type=int, default=3)
+    args = parser.parse_args()
+
+    train_playstyle_models(args.log_directory, args.model_directory, args.chunk_size, args.epochs, args.clusters)
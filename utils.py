@@ -1,30 +1,46 @@
 import time
-import psutil
 import logging
 import functools
 
+# psutil is imported on first use so it stays off the startup path
+_process = None
+
+def get_process():
+    """Return a reused psutil handle for this process."""
+    global _process
+    if _process is None:
+        import psutil
+        _process = psutil.Process()
+    return _process
+
+def find_process(process_name):
+    """Return a psutil handle for the first process with the given name, or None."""
+    import psutil
+    target = process_name.lower()
+    for process in psutil.process_iter(['name']):
+        if (process.info['name'] or '').lower() == target:
+            return process
+    return None
+
 def performance_monitor(func):
     """Decorator to monitor function performance."""
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        start_time = time.time()
-        start_memory = psutil.Process().memory_info().rss / 1024 / 1024  # MB
-        
+        start_time = time.perf_counter()
+
         result = func(*args, **kwargs)
-        
-        end_time = time.time()
-        end_memory = psutil.Process().memory_info().rss / 1024 / 1024  # MB
-        
-        execution_time = (end_time - start_time) * 1000  # Convert to ms
-        memory_delta = end_memory - start_memory
-        
+
+        execution_time = (time.perf_counter() - start_time) * 1000  # Convert to ms
+
         if execution_time > 16.67:  # More than 60fps threshold
+            # Memory is only sampled for slow calls to keep the common path cheap
+            memory_usage = get_process().memory_info().rss / 1024 / 1024  # MB
             logging.warning(
                 f"Performance warning in {func.__name__}: "
                 f"Execution time: {execution_time:.2f}ms, "
-                f"Memory delta: {memory_delta:.2f}MB"
+                f"Memory usage: {memory_usage:.2f}MB"
             )
-            
+
         return result
     return wrapper
 
@@ -33,8 +49,8 @@ def format_timestamp(timestamp):
     return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timestamp))
 
 def calculate_fps(frame_times):
-    """Calculate FPS from frame times."""
-    if not frame_times:
+    """Calculate FPS from frame times (a sequence or NumPy array of seconds)."""
+    if len(frame_times) == 0:
         return 0
     avg_frame_time = sum(frame_times) / len(frame_times)
     return 1.0 / avg_frame_time if avg_frame_time > 0 else 0